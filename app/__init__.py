@@ -27,6 +27,40 @@ def create_app():
     from app.routes.api import api_bp
     app.register_blueprint(api_bp, url_prefix='')  # ✅ No prefix for root access
     
+    from config.settings import config as settings
+    if settings.YTDLP_PRELOAD:
+        # Runs in the gunicorn master under --preload: forked workers inherit the warm state
+        from app.services.extraction_engine import preload_ytdlp
+        from app.services.multi_platform_service import PLATFORM_EXTRACTORS
+        warmup = preload_ytdlp(PLATFORM_EXTRACTORS, settings.YTDLP_WARMUP_FIXTURE or None)
+        app.logger.info(f"Preloaded yt-dlp: {warmup}")
+    
+    # Resume background jobs persisted by earlier (or crashed) workers. Deferred to the first
+    # request: creating the service here would start its threads in the gunicorn master under
+    # --preload (threads do not survive the fork) and slow down every import of the app.
+    # Tried once per worker; a failure is logged and left to the job routes, which build
+    # the manager themselves, instead of failing every request (/web and static files too).
+    if settings.JOBS_ENABLED:
+        import threading
+        from app.services.job_service import get_job_manager
+        from app.services.multi_platform_service import get_multi_platform_service
+        
+        resume_lock = threading.Lock()
+        resumed = []
+        
+        @app.before_request
+        def resume_jobs():
+            if resumed:
+                return
+            with resume_lock:
+                if resumed:
+                    return
+                resumed.append(True)
+                try:
+                    get_job_manager(get_multi_platform_service())
+                except Exception as e:
+                    app.logger.error(f"❌ Could not resume background jobs: {e}")
+    
     # Web interface route (separate from API)
     @app.route('/web')
     def web_interface():
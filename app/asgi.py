@@ -0,0 +1,203 @@
+"""
+ASGI Entry Point
+Serves the Flask routes from an asyncio event loop so slow extractions do not pin server threads
+
+Run with:  uvicorn app.asgi:application --host 0.0.0.0 --port 5000
+"""
+import asyncio
+import contextvars
+import io
+import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from app import create_app
+from config.settings import config as settings
+
+logger = logging.getLogger(__name__)
+
+# Routes that run yt-dlp and may take minutes
+EXTRACTION_ROUTES = {('GET', '/'), ('POST', '/batch')}
+
+
+class AsgiApplication:
+    """
+    Runs a WSGI (Flask) application behind an asyncio event loop
+
+    Connections and pending requests live on the event loop, which can hold
+    hundreds of them cheaply. Extraction routes execute on a bounded executor
+    (ASGI_EXTRACTION_CONCURRENCY threads) and the rest wait as queued work
+    items rather than blocked threads. Cheap routes (/health, /stats, /jobs,
+    ...) use a separate small executor so they stay responsive while
+    extractions queue up. Requests beyond ASGI_MAX_PENDING extractions are
+    rejected with 503.
+
+    The executor bounds requests, not yt-dlp runs: a request holds its thread
+    through rate-scheduler waits, and a /batch request fans out to the batch
+    pool while holding a single thread; background jobs never pass through
+    here at all. EXTRACTION_CONCURRENCY is the bound on yt-dlp itself across
+    all of them, taken only once the scheduler's wait is over, so with it set
+    the executor can be sized well above it to absorb scheduler waits.
+    """
+
+    def __init__(self, wsgi_app, extraction_concurrency: int = 8,
+                 general_threads: int = 4, max_pending: int = 500):
+        self.wsgi_app = wsgi_app
+        self.max_pending = max_pending
+        self._extraction_executor = ThreadPoolExecutor(max_workers=extraction_concurrency,
+                                                       thread_name_prefix='asgi-extract')
+        self._general_executor = ThreadPoolExecutor(max_workers=general_threads,
+                                                    thread_name_prefix='asgi')
+        self._pending = 0
+
+    async def __call__(self, scope: Dict[str, Any], receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self._http(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self._extraction_executor.shutdown(wait=False, cancel_futures=True)
+                self._general_executor.shutdown(wait=False, cancel_futures=True)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _http(self, scope: Dict[str, Any], receive, send):
+        body = bytearray()
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return
+            body.extend(message.get('body', b''))
+            if not message.get('more_body'):
+                break
+
+        heavy = (scope['method'], scope['path']) in EXTRACTION_ROUTES
+        if heavy and self._pending >= self.max_pending:
+            await self._send_simple(send, 503, b'{"error": "Server busy, retry later"}', retry_after='5')
+            return
+
+        executor = self._extraction_executor if heavy else self._general_executor
+        environ = self._build_environ(scope, bytes(body))
+        loop = asyncio.get_running_loop()
+        
+        # Every step of one request runs in the same context, even when it lands on a
+        # different executor thread, so Flask's request context survives streaming
+        context = contextvars.copy_context()
+        
+        def run(fn, *args):
+            return loop.run_in_executor(executor, context.run, fn, *args)
+
+        if heavy:
+            self._pending += 1
+        try:
+            status, headers, iterator = await run(self._call_wsgi, environ)
+
+            await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+
+            sentinel = object()
+            try:
+                while True:
+                    chunk = await run(next, iterator, sentinel)
+                    if chunk is sentinel:
+                        break
+                    if chunk:
+                        await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            finally:
+                await run(iterator.close)
+
+            await send({'type': 'http.response.body', 'body': b''})
+        finally:
+            if heavy:
+                self._pending -= 1
+
+    def _call_wsgi(self, environ: Dict[str, Any]) -> Tuple[int, List[Tuple[bytes, bytes]], Any]:
+        """Invoke the WSGI app (in an executor thread) and capture status and headers"""
+        response: Dict[str, Any] = {}
+
+        def start_response(status: str, headers: List[Tuple[str, str]], exc_info=None):
+            response['status'] = int(status.split(' ', 1)[0])
+            response['headers'] = [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                                   for name, value in headers]
+
+        result = self.wsgi_app(environ, start_response)
+        return response['status'], response['headers'], _ClosingIterator(result)
+
+    @staticmethod
+    def _build_environ(scope: Dict[str, Any], body: bytes) -> Dict[str, Any]:
+        """Translate an ASGI HTTP scope into a PEP 3333 environ"""
+        server_name, server_port = scope.get('server') or ('localhost', 80)
+        client_host, client_port = scope.get('client') or ('', 0)
+
+        environ = {
+            'REQUEST_METHOD': scope['method'],
+            'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+            'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+            'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+            'SERVER_NAME': server_name,
+            'SERVER_PORT': str(server_port),
+            'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+            'REMOTE_ADDR': client_host,
+            'REMOTE_PORT': str(client_port),
+            'CONTENT_LENGTH': str(len(body)),
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': scope.get('scheme', 'http'),
+            'wsgi.input': io.BytesIO(body),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': True,
+            'wsgi.run_once': False,
+        }
+
+        for raw_name, raw_value in scope.get('headers', []):
+            name = raw_name.decode('latin-1').upper().replace('-', '_')
+            value = raw_value.decode('latin-1')
+            if name == 'CONTENT_TYPE':
+                environ['CONTENT_TYPE'] = value
+                continue
+            if name == 'CONTENT_LENGTH':
+                continue
+            key = f'HTTP_{name}'
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+
+        return environ
+
+    @staticmethod
+    async def _send_simple(send, status: int, body: bytes, retry_after: Optional[str] = None):
+        headers = [(b'content-type', b'application/json')]
+        if retry_after:
+            headers.append((b'retry-after', retry_after.encode('latin-1')))
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': body})
+
+
+class _ClosingIterator:
+    """Iterator over a WSGI result that keeps its close() method"""
+
+    def __init__(self, result):
+        self._result = result
+        self._iterator = iter(result)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._iterator)
+
+    def close(self):
+        if hasattr(self._result, 'close'):
+            self._result.close()
+
+
+application = AsgiApplication(
+    create_app(),
+    extraction_concurrency=settings.ASGI_EXTRACTION_CONCURRENCY,
+    general_threads=settings.ASGI_GENERAL_THREADS,
+    max_pending=settings.ASGI_MAX_PENDING
+)
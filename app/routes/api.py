@@ -1,23 +1,58 @@
 """
 API Routes for Multi-Platform yt-dlp JSON Extractor
 """
-from flask import Blueprint, request, jsonify
-from app.services.multi_platform_service import multi_platform_service
-from app.utils.validators import is_valid_url, sanitize_url
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from app.services.multi_platform_service import get_multi_platform_service
+from app.services.batch_service import get_batch_extractor
+from app.services.job_service import get_job_manager
+from app.services.error_classifier import classify_error
+from app.utils.validators import is_valid_url, resolve_callback_address, sanitize_url
+from app.utils.projection import FieldTree, parse_field_paths
+from app.utils.response import build_result, mode_fields, requested_fields
+from app.utils.serialization import encode, negotiate
+from app.utils.streaming import iter_json
+from config.settings import config as settings
+import json
 import logging
 from datetime import datetime
+from typing import Any, FrozenSet
 
 api_bp = Blueprint('api', __name__)
 logger = logging.getLogger(__name__)
 
+def _respond(body: Any) -> Response:
+    """Encode a response body as JSON, or as MessagePack / CBOR when the Accept header asks for it"""
+    mimetype = negotiate(request.accept_mimetypes)
+    response = Response(encode(body, mimetype), mimetype=mimetype) if mimetype else jsonify(body)
+    response.vary.add('Accept')
+    return response
+
+def _skippable_sections(fields: FieldTree, excluded: FieldTree) -> FrozenSet[str]:
+    """Extraction sections not needed for the requested projection"""
+    return get_multi_platform_service().prunable_sections(requested_fields(fields, excluded))
+
 @api_bp.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
+    breakers = get_multi_platform_service().get_breaker_states()
+    
     return jsonify({
-        'status': 'healthy',
+        'status': 'degraded' if any(b['state'] != 'closed' for b in breakers.values()) else 'healthy',
         'timestamp': datetime.utcnow().isoformat(),
         'service': 'Multi-Platform yt-dlp JSON Extractor',
-        'supported_platforms': ['youtube', 'instagram', 'facebook']
+        'supported_platforms': ['youtube', 'instagram', 'facebook'],
+        'circuit_breakers': breakers
+    })
+
+@api_bp.route('/stats', methods=['GET'])
+def get_stats():
+    """Extraction engine and cache statistics"""
+    service = get_multi_platform_service()
+    return jsonify({
+        'timestamp': datetime.utcnow().isoformat(),
+        **service.get_stats(),
+        'batch': get_batch_extractor(service).get_stats(),
+        'jobs': get_job_manager(service).get_stats() if settings.JOBS_ENABLED else {'enabled': False}
     })
 
 @api_bp.route('/', methods=['GET'])
@@ -29,12 +64,24 @@ def extract_from_url_param():
     - YouTube: /?url=https://www.youtube.com/watch?v=VIDEO_ID
     - Instagram: /?url=https://www.instagram.com/p/POST_ID/
     - Facebook: /?url=https://www.facebook.com/watch?v=VIDEO_ID
+    
+    Optional projection (comma separated dotted paths, lists are traversed):
+    - fields=title,duration,formats.url   keep only these (any raw yt-dlp field can be requested)
+    - exclude=formats,comments            drop these
+    - mode=basic                          title, uploader, duration, view_count, upload_date and
+                                          like_count only; formats and captions are never resolved
+    
+    Optional streaming:
+    - stream=1   send cheap fields first and large arrays incrementally
+    
+    Responses are JSON unless the Accept header asks for application/msgpack or
+    application/cbor (when msgpack / cbor2 are installed).
     """
     try:
         raw_url = request.args.get('url', '').strip().strip('"\'')
         
         if not raw_url:
-            return jsonify({
+            return _respond({
                 'error': 'URL parameter required',
                 'usage': '/?url=https://platform.com/video',
                 'supported_platforms': ['YouTube', 'Instagram', 'Facebook'],
@@ -47,63 +94,183 @@ def extract_from_url_param():
         
         url = sanitize_url(raw_url)
         if not is_valid_url(url):
-            return jsonify({'error': 'Invalid URL format'}), 400
+            return _respond({'error': 'Invalid URL format'}), 400
         
         # ✅ Detect platform
-        platform_info = multi_platform_service.get_platform_info(url)
+        platform_info = get_multi_platform_service().get_platform_info(url)
         logger.info(f"Processing {platform_info['platform']} URL: {url}")
         
         if not platform_info['supported']:
-            return jsonify({
+            return _respond({
                 'error': f"Unsupported platform: {platform_info['platform']}",
                 'supported_platforms': ['youtube', 'instagram', 'facebook'],
                 'detected_platform': platform_info['platform']
             }), 400
         
+        # ✅ Field projection; unrequested sections are skipped during extraction too
+        try:
+            fields = parse_field_paths(mode_fields(request.args.get('mode', ''), request.args.get('fields', '')))
+        except ValueError as e:
+            return _respond({'error': str(e)}), 400
+        excluded = parse_field_paths(request.args.get('exclude', ''))
+        skip = _skippable_sections(fields, excluded)
+        
         # ✅ Extract with platform-specific service
-        success, raw_metadata, error = multi_platform_service.extract_metadata_raw(url)
+        success, raw_metadata, error = get_multi_platform_service().extract_metadata_raw(url, skip=skip)
         
         if success:
-            # ✅ Add platform info to response
-            raw_metadata['platform_info'] = {
-                'detected_platform': platform_info['platform'],
-                'extraction_service': 'multi_platform_ytdlp'
-            }
-
-            result = {
-                'filename': raw_metadata.get('_filename', raw_metadata.get('filename', 'Unknown')),
-                'type': raw_metadata.get('_type', 'video'),
-                'channel': raw_metadata.get('channel', raw_metadata.get('uploader', 'Unknown')),
-                'comment_count': raw_metadata.get('comment_count', 0),
-                'aspect_ratio': raw_metadata.get('aspect_ratio'),
-                'description': raw_metadata.get('description', ''),
-                'title': raw_metadata.get('title', 'Unknown'),
-                'duration': raw_metadata.get('duration'),
-                'ext': raw_metadata.get('ext', 'mp4'),
-                'comments': raw_metadata.get('comments', []),
-                'webpage_url': raw_metadata.get('webpage_url', url),
-                'webpage_url_domain': raw_metadata.get('webpage_url_domain', ''),
-                'width': raw_metadata.get('width'),
-                'height': raw_metadata.get('height'),
-                'view_count': raw_metadata.get('view_count'),
-                'like_count': raw_metadata.get('like_count'),
-                'upload_date': raw_metadata.get('upload_date'),
-                'formats': raw_metadata.get('formats', []),
-                'detected_platform': platform_info['platform'],
-                'extraction_service': 'multi_platform_ytdlp'
-            }
-            return jsonify(result)
+            result = build_result(raw_metadata, url, platform_info['platform'], fields, excluded)
+            
+            # Streaming is a JSON feature; binary encodings are sent whole
+            if request.args.get('stream', '').lower() in ('1', 'true', 'yes') and not negotiate(request.accept_mimetypes):
+                return Response(stream_with_context(iter_json(result)), mimetype='application/json')
+            return _respond(result)
         else:
-            return jsonify({
+            body = {
                 'error': error or 'Extraction failed',
+                'error_type': classify_error(error),
                 'platform': platform_info['platform'],
                 'url': url,
                 'platform_info': platform_info
-            }), 422
+            }
+            
+            # Failed fast (circuit open, per-video backoff or scheduler queue full): tell the client when to come back
+            retry_after = getattr(error, 'retry_after', None)
+            if retry_after:
+                body['retry_after'] = retry_after
+                response = _respond(body)
+                response.headers['Retry-After'] = str(retry_after)
+                return response, 503
+            return _respond(body), 422
             
     except Exception as e:
         logger.error(f"API error: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return _respond({'error': 'Internal server error'}), 500
+
+@api_bp.route('/batch', methods=['POST'])
+def extract_batch():
+    """
+    Extract metadata for many URLs in one request
+    
+    Body: {"urls": ["https://...", ...], "fields": "title,duration", "exclude": "formats", "mode": "basic"}
+    
+    URLs for the same video are extracted once. Results are streamed back as
+    NDJSON (one JSON object per line) in completion order; each line carries
+    the input index, and per-URL failures are reported inline.
+    """
+    payload = request.get_json(silent=True) or {}
+    raw_urls = payload.get('urls')
+    
+    if not isinstance(raw_urls, list) or not raw_urls:
+        return jsonify({
+            'error': 'JSON body with a non-empty "urls" list required',
+            'usage': 'POST /batch {"urls": ["https://www.youtube.com/watch?v=dQw4w9WgXcQ"]}'
+        }), 400
+    
+    if len(raw_urls) > settings.BATCH_MAX_URLS:
+        return jsonify({'error': f"Too many URLs (max {settings.BATCH_MAX_URLS})"}), 400
+    
+    try:
+        fields = parse_field_paths(mode_fields(payload.get('mode', ''), payload.get('fields', '')))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    excluded = parse_field_paths(payload.get('exclude', ''))
+    skip = _skippable_sections(fields, excluded)
+    
+    urls = []
+    invalid = []
+    for index, raw_url in enumerate(raw_urls):
+        url = sanitize_url(str(raw_url).strip().strip('"\'')) if raw_url else ''
+        if is_valid_url(url):
+            urls.append((index, url))
+        else:
+            invalid.append({'index': index, 'url': raw_url, 'success': False, 'error': 'Invalid URL format'})
+    
+    extractor = get_batch_extractor(get_multi_platform_service())
+    logger.info(f"Processing batch of {len(raw_urls)} URLs")
+    
+    def generate():
+        for line in invalid:
+            yield json.dumps(line) + '\n'
+        
+        for item in extractor.run([url for _, url in urls], skip=skip):
+            line = {
+                'index': urls[item['index']][0],
+                'url': item['url'],
+                'platform': item['platform'],
+                'success': item['success'],
+            }
+            if item['success']:
+                line['data'] = build_result(item['metadata'], item['url'], item['platform'], fields, excluded)
+            else:
+                line['error'] = item['error'] or 'Extraction failed'
+                line['error_type'] = classify_error(item['error'])
+            yield json.dumps(line) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@api_bp.route('/jobs', methods=['POST'])
+def create_job():
+    """
+    Queue an extraction and return immediately
+    
+    Body: {"url": "https://...", "fields": "...", "exclude": "...", "mode": "basic", "callback_url": "https://..."}
+    
+    Poll GET /jobs/<id> for the result; if callback_url is given it receives
+    the finished job as a JSON POST.
+    """
+    if not settings.JOBS_ENABLED:
+        return jsonify({'error': 'Background jobs are disabled'}), 404
+    
+    payload = request.get_json(silent=True) or {}
+    raw_url = str(payload.get('url') or '').strip().strip('"\'')
+    
+    if not raw_url:
+        return jsonify({
+            'error': 'JSON body with "url" required',
+            'usage': 'POST /jobs {"url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ", "callback_url": "https://..."}'
+        }), 400
+    
+    url = sanitize_url(raw_url)
+    if not is_valid_url(url):
+        return jsonify({'error': 'Invalid URL format'}), 400
+    
+    platform_info = get_multi_platform_service().get_platform_info(url)
+    if not platform_info['supported']:
+        return jsonify({
+            'error': f"Unsupported platform: {platform_info['platform']}",
+            'supported_platforms': ['youtube', 'instagram', 'facebook'],
+            'detected_platform': platform_info['platform']
+        }), 400
+    
+    try:
+        fields = mode_fields(payload.get('mode', ''), payload.get('fields', ''))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    callback_url = payload.get('callback_url')
+    if callback_url and resolve_callback_address(str(callback_url), settings.JOBS_CALLBACK_ALLOWLIST) is None:
+        return jsonify({'error': 'Invalid callback_url: must be an http(s) URL on a public, allowed host'}), 400
+    
+    job = get_job_manager(get_multi_platform_service()).submit(
+        url,
+        fields=fields,
+        exclude=payload.get('exclude', ''),
+        callback_url=callback_url
+    )
+    job['status_url'] = f"{request.host_url}jobs/{job['id']}"
+    return jsonify(job), 202
+
+@api_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Get the status (and result once finished) of a background job"""
+    if not settings.JOBS_ENABLED:
+        return _respond({'error': 'Background jobs are disabled'}), 404
+    
+    job = get_job_manager(get_multi_platform_service()).get(job_id)
+    if job is None:
+        return _respond({'error': 'Job not found'}), 404
+    return _respond(job)
 
 @api_bp.route('/platform-info', methods=['GET'])
 def get_platform_info():
@@ -114,7 +281,7 @@ def get_platform_info():
         return jsonify({'error': 'URL parameter required'}), 400
     
     url = sanitize_url(url)
-    platform_info = multi_platform_service.get_platform_info(url)
+    platform_info = get_multi_platform_service().get_platform_info(url)
     
     return jsonify(platform_info)
 
@@ -123,7 +290,7 @@ def get_supported_platforms():
     """Get list of supported platforms and their configurations"""
     platforms = {}
     
-    for platform, config in multi_platform_service.platform_configs.items():
+    for platform, config in get_multi_platform_service().platform_configs.items():
         platforms[platform] = {
             'cookies_file': config['cookies'],
             'user_agent': config['user_agent'][:50] + '...',  # Truncate for readability
@@ -0,0 +1,129 @@
+"""
+Batch Extraction Service
+Deduplicated, bounded-parallel extraction of many URLs
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, FrozenSet, Iterator, List, Optional, Tuple
+
+from app.services.error_classifier import ERROR_PERMANENT, ExtractionError
+from config.settings import config as settings
+
+logger = logging.getLogger(__name__)
+
+
+class BatchExtractor:
+    """
+    Runs extractions for a list of URLs on bounded, per-platform thread pools
+
+    URLs pointing to the same video (same platform + canonical ID) are
+    extracted once. Each platform has its own pool, sized by its concurrency
+    cap, so items queued behind a slow or blocked platform never hold threads
+    the others need; pacing is left to the service's rate scheduler, so batch
+    and single requests share the same budget. Cache hits are answered before
+    anything is queued.
+    """
+
+    def __init__(self, service, max_workers: int = 8, platform_concurrency: Optional[Dict[str, int]] = None):
+        self.service = service
+        self.max_workers = max_workers
+        self._executors = {
+            platform: ThreadPoolExecutor(
+                max_workers=min(max((platform_concurrency or {}).get(platform, 1), 1), max_workers),
+                thread_name_prefix=f'batch-{platform}'
+            )
+            for platform in service.platform_configs
+        }
+        self._stats = {'batches': 0, 'urls': 0, 'unique': 0, 'cached': 0, 'active': 0}
+        self._lock = threading.Lock()
+
+    def _extract(self, url: str, skip: FrozenSet[str]) -> Tuple[bool, Optional[Dict], Optional[str]]:
+        with self._lock:
+            self._stats['active'] += 1
+        try:
+            return self.service.extract_metadata_raw(url, skip=skip)
+        finally:
+            with self._lock:
+                self._stats['active'] -= 1
+
+    def run(self, urls: List[str], skip: FrozenSet[str] = frozenset()) -> Iterator[Dict[str, Any]]:
+        """
+        Extract every URL, yielding results as they finish
+
+        Args:
+            urls: Sanitized URLs (duplicates and unsupported URLs allowed)
+            skip: Sections to leave out of each extraction
+
+        Yields:
+            One dict per input URL with index, url, platform, success,
+            metadata (on success) and error (on failure)
+        """
+        groups: Dict[Tuple[str, str], List[int]] = {}
+        for index, url in enumerate(urls):
+            platform = self.service.detect_platform(url)
+            if platform not in self._executors:
+                yield {'index': index, 'url': url, 'platform': platform, 'success': False,
+                       'metadata': None, 'error': ExtractionError(f"Unsupported platform: {platform}", ERROR_PERMANENT)}
+                continue
+            groups.setdefault((platform, self.service.canonical_id(url, platform)), []).append(index)
+
+        with self._lock:
+            self._stats['batches'] += 1
+            self._stats['urls'] += len(urls)
+            self._stats['unique'] += len(groups)
+
+        futures = {}
+        cached = []
+        for (platform, _), indices in groups.items():
+            metadata = self.service.lookup_cached(urls[indices[0]], skip)
+            if metadata is not None:
+                cached.append((platform, indices, metadata))
+                continue
+            futures[self._executors[platform].submit(self._extract, urls[indices[0]], skip)] = (platform, indices)
+
+        with self._lock:
+            self._stats['cached'] += len(cached)
+
+        try:
+            for platform, indices, metadata in cached:
+                for index in indices:
+                    yield {'index': index, 'url': urls[index], 'platform': platform,
+                           'success': True, 'metadata': metadata, 'error': None}
+
+            for future in as_completed(futures):
+                platform, indices = futures[future]
+                try:
+                    success, metadata, error = future.result()
+                except Exception as e:
+                    logger.error(f"Batch extraction error for {urls[indices[0]]}: {e}")
+                    success, metadata, error = False, None, f"Internal error: {e}"
+
+                for index in indices:
+                    yield {'index': index, 'url': urls[index], 'platform': platform,
+                           'success': success, 'metadata': metadata, 'error': error}
+        finally:
+            # Client went away or the batch finished: drop work that has not started
+            for future in futures:
+                future.cancel()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Batch counters for monitoring"""
+        with self._lock:
+            return {'max_workers': self.max_workers, **self._stats}
+
+
+_batch_extractor = None
+_batch_lock = threading.Lock()
+
+def get_batch_extractor(service) -> BatchExtractor:
+    """Shared batch extractor, created on first use"""
+    global _batch_extractor
+    with _batch_lock:
+        if _batch_extractor is None:
+            _batch_extractor = BatchExtractor(
+                service,
+                max_workers=settings.BATCH_MAX_WORKERS,
+                platform_concurrency=settings.BATCH_PLATFORM_CONCURRENCY
+            )
+        return _batch_extractor
@@ -0,0 +1,274 @@
+"""
+Cache Backends
+Byte-level storage for the metadata cache: in-process LRU, SQLite file, Redis
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+try:
+    import redis
+except ImportError:  # Optional dependency, only needed for the redis backend
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend:
+    """Interface for cache storage; values are opaque bytes with a TTL"""
+
+    name = 'base'
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: int):
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {'backend': self.name}
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    In-process LRU storage with an entry count and a byte ceiling
+
+    Not shared between workers; every gunicorn worker holds its own copy.
+    """
+
+    name = 'memory'
+
+    def __init__(self, max_entries: int = 512, max_bytes: int = 256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._bytes = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.time():
+                self._remove(key)
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: int):
+        if len(value) > self.max_bytes:
+            return
+
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.time() + ttl, value)
+            self._bytes += len(value)
+
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def delete(self, key: str):
+        with self._lock:
+            self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry[1])
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'backend': self.name,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'evictions': self._evictions,
+            }
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    SQLite file storage shared by every worker process on the host
+
+    Uses WAL mode so readers in other workers are not blocked by writes.
+    Least recently used rows are pruned once the entry or byte ceiling is exceeded.
+    """
+
+    name = 'sqlite'
+
+    def __init__(self, path: str, max_entries: int = 4096, max_bytes: int = 1024 * 1024 * 1024):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS cache ('
+                'key TEXT PRIMARY KEY, value BLOB NOT NULL, '
+                'expires_at REAL NOT NULL, accessed_at REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed_at)')
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[bytes]:
+        conn = self._connect()
+        now = time.time()
+        row = conn.execute('SELECT value, expires_at FROM cache WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+
+        value, expires_at = row
+        with conn:
+            if expires_at <= now:
+                conn.execute('DELETE FROM cache WHERE key = ?', (key,))
+                return None
+            conn.execute('UPDATE cache SET accessed_at = ? WHERE key = ?', (now, key))
+        return value
+
+    def set(self, key: str, value: bytes, ttl: int):
+        if len(value) > self.max_bytes:
+            return
+
+        conn = self._connect()
+        now = time.time()
+        with conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)',
+                (key, sqlite3.Binary(value), now + ttl, now)
+            )
+            conn.execute('DELETE FROM cache WHERE expires_at <= ?', (now,))
+            self._prune(conn)
+
+    def _prune(self, conn: sqlite3.Connection):
+        count, total = conn.execute('SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM cache').fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        rows = conn.execute('SELECT key, LENGTH(value) FROM cache ORDER BY accessed_at').fetchall()
+        doomed = []
+        for key, size in rows:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            count -= 1
+            total -= size
+        conn.executemany('DELETE FROM cache WHERE key = ?', doomed)
+
+    def delete(self, key: str):
+        conn = self._connect()
+        with conn:
+            conn.execute('DELETE FROM cache WHERE key = ?', (key,))
+
+    def clear(self):
+        conn = self._connect()
+        with conn:
+            conn.execute('DELETE FROM cache')
+
+    def get_stats(self) -> Dict[str, Any]:
+        count, total = self._connect().execute(
+            'SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM cache'
+        ).fetchone()
+        return {
+            'backend': self.name,
+            'path': self.path,
+            'entries': count,
+            'bytes': total,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+        }
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Redis (or any Redis-protocol server) storage shared across workers and hosts
+
+    Expiry is delegated to the server; configure `maxmemory-policy allkeys-lru`
+    on the server for the memory ceiling.
+    """
+
+    name = 'redis'
+
+    def __init__(self, url: str, prefix: str = 'ytdlp:'):
+        if redis is None:
+            raise RuntimeError("The redis cache backend requires the 'redis' package (pip install redis)")
+
+        self.url = url
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: int):
+        self._client.set(self.prefix + key, value, ex=max(int(ttl), 1))
+
+    def delete(self, key: str):
+        self._client.delete(self.prefix + key)
+
+    def clear(self):
+        keys = list(self._client.scan_iter(match=self.prefix + '*'))
+        if keys:
+            self._client.delete(*keys)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {'backend': self.name, 'prefix': self.prefix}
+
+
+def create_cache_backend(name: str, max_entries: int, max_bytes: int,
+                         path: str = None, redis_url: str = None) -> CacheBackend:
+    """
+    Create a cache backend by name
+
+    Args:
+        name: 'memory', 'sqlite' or 'redis'
+        max_entries: Entry ceiling (memory and sqlite)
+        max_bytes: Byte ceiling (memory and sqlite)
+        path: Database file (sqlite)
+        redis_url: Server URL (redis)
+
+    Returns:
+        Backend instance
+    """
+    if name == MemoryCacheBackend.name:
+        return MemoryCacheBackend(max_entries=max_entries, max_bytes=max_bytes)
+    if name == SQLiteCacheBackend.name:
+        return SQLiteCacheBackend(path, max_entries=max_entries, max_bytes=max_bytes)
+    if name == RedisCacheBackend.name:
+        return RedisCacheBackend(redis_url)
+
+    raise ValueError(f"Unknown cache backend: {name}. Choose from: memory, sqlite, redis")
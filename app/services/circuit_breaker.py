@@ -0,0 +1,120 @@
+"""
+Circuit Breaker
+Stops sending extractions to a platform that keeps failing, and probes for recovery
+"""
+import logging
+import threading
+import time
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+STATE_CLOSED = 'closed'
+STATE_OPEN = 'open'
+STATE_HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """
+    Per-platform circuit breaker
+
+    After `failure_threshold` consecutive failed extractions the breaker
+    opens and requests fail fast. Once `reset_timeout` has passed it turns
+    half-open and lets `half_open_probes` requests through: a success closes
+    it again, a failure reopens it with the timeout doubled (up to
+    `max_reset_timeout`), so a platform that stays blocked is probed less
+    and less often.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 60,
+                 max_reset_timeout: float = 900, half_open_probes: int = 1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.half_open_probes = half_open_probes
+
+        self._lock = threading.Lock()
+        self._state = STATE_CLOSED
+        self._failures = 0
+        self._reset_timeout = reset_timeout
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_started = 0.0
+        self._stats = {'opened': 0, 'rejected': 0}
+
+    def allow(self) -> Tuple[bool, Optional[int]]:
+        """
+        Check whether an extraction may run
+
+        Returns:
+            Tuple of (allowed, retry_after seconds when not allowed)
+        """
+        with self._lock:
+            if self._state == STATE_OPEN:
+                remaining = self._opened_at + self._reset_timeout - time.time()
+                if remaining > 0:
+                    self._stats['rejected'] += 1
+                    return False, max(int(remaining), 1)
+                self._state = STATE_HALF_OPEN
+                self._probes = 0
+                logger.info(f"🟡 Circuit for {self.name} half-open, probing")
+
+            if self._state == STATE_HALF_OPEN:
+                # A probe that never reported back (e.g. it crashed) must not wedge the breaker
+                if self._probes >= self.half_open_probes and time.time() - self._probe_started > self._reset_timeout:
+                    self._probes = 0
+                if self._probes >= self.half_open_probes:
+                    self._stats['rejected'] += 1
+                    return False, max(int(self._reset_timeout / 4), 1)
+                self._probes += 1
+                self._probe_started = time.time()
+
+            return True, None
+
+    def record_success(self):
+        """The platform answered (including definite answers such as 'video unavailable')"""
+        with self._lock:
+            if self._state != STATE_CLOSED:
+                logger.info(f"🟢 Circuit for {self.name} closed")
+            self._state = STATE_CLOSED
+            self._failures = 0
+            self._reset_timeout = self.base_reset_timeout
+
+    def record_failure(self):
+        """An extraction failed for reasons that may be on the platform's side (blocks, errors)"""
+        with self._lock:
+            self._failures += 1
+
+            if self._state == STATE_HALF_OPEN:
+                self._reset_timeout = min(self._reset_timeout * 2, self.max_reset_timeout)
+                self._open()
+            elif self._state == STATE_CLOSED and self._failures >= self.failure_threshold:
+                self._open()
+
+    def release(self):
+        """An allowed extraction never reached the platform; give back its half-open probe"""
+        with self._lock:
+            if self._state == STATE_HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def _open(self):
+        self._state = STATE_OPEN
+        self._opened_at = time.time()
+        self._stats['opened'] += 1
+        logger.warning(f"🔴 Circuit for {self.name} open for {self._reset_timeout:.0f}s "
+                       f"after {self._failures} consecutive failures")
+
+    def get_state(self) -> Dict[str, Any]:
+        """Breaker state for health checks and monitoring"""
+        with self._lock:
+            state = {
+                'state': self._state,
+                'consecutive_failures': self._failures,
+                'failure_threshold': self.failure_threshold,
+                'reset_timeout': self._reset_timeout,
+                **self._stats
+            }
+            if self._state == STATE_OPEN:
+                state['retry_after'] = max(int(self._opened_at + self._reset_timeout - time.time()), 0)
+            return state
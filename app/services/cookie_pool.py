@@ -0,0 +1,435 @@
+"""
+Cookie Pool
+Rotates a directory of cookie jars per platform, quarantines jars that keep hitting bot checks
+and hot-reloads refreshed cookie files
+"""
+import glob
+import http.cookiejar
+import logging
+import os
+import shutil
+import threading
+import time
+from typing import Callable, Dict, Any, Iterable, List, Optional, Tuple
+
+try:
+    import inotify_simple
+except ImportError:  # Optional dependency, files are polled for mtime changes instead
+    inotify_simple = None
+
+logger = logging.getLogger(__name__)
+
+
+def _signature(path: str) -> Tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class CookieJar:
+    """
+    One Netscape cookie file and its health
+
+    `path` is the operator-managed file; `active_path` is what yt-dlp is
+    given. With a snapshot directory they differ: every version of the file
+    is copied to its own snapshot, so yt-dlp writing cookies back never
+    touches (or re-triggers a reload of) the operator's file, and a reload
+    can swap versions without disturbing extractions using the old one.
+    Snapshots live in a directory of their own per process, so workers
+    never share (or delete) each other's copies.
+    """
+
+    def __init__(self, platform: str, path: str):
+        self.platform = platform
+        self.path = path
+        self.active_path = path
+        self.signature: Optional[Tuple[int, int]] = None
+        self.reloads = 0
+        self.cookies = 0
+        self.expires_at: Optional[int] = None
+        self.last_used = 0.0
+        self.successes = 0
+        self.failures = 0
+        self.auth_failures = 0
+        self.consecutive_auth_failures = 0
+        self.quarantined_until = 0.0
+
+    def parse(self, snapshot_dir: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Parse the current file (and snapshot it) without touching the jar's state
+
+        Returns:
+            The fields to swap in: signature, active_path, cookies, expires_at
+        """
+        signature = _signature(self.path)
+        jar = http.cookiejar.MozillaCookieJar(self.path)
+        jar.load(ignore_discard=True, ignore_expires=True)
+        expiries = [cookie.expires for cookie in jar if cookie.expires]
+
+        active_path = self.path
+        if snapshot_dir:
+            name = os.path.splitext(os.path.basename(self.path))[0]
+            directory = os.path.join(snapshot_dir, str(os.getpid()), self.platform)
+            os.makedirs(directory, exist_ok=True)
+            active_path = os.path.abspath(os.path.join(directory, f"{name}-{signature[0]}.txt"))
+            temp_path = f"{active_path}.tmp"
+            shutil.copyfile(self.path, temp_path)
+            os.replace(temp_path, active_path)
+
+        return {
+            'signature': signature,
+            'active_path': active_path,
+            'cookies': len(jar),
+            'expires_at': min(expiries) if expiries else None,
+        }
+
+    @property
+    def score(self) -> float:
+        """Laplace-smoothed success rate"""
+        return (self.successes + 1) / (self.successes + self.failures + 2)
+
+    def is_quarantined(self, now: float) -> bool:
+        return self.quarantined_until > now
+
+    def to_dict(self, now: float) -> Dict[str, Any]:
+        return {
+            'path': self.path,
+            'active_path': self.active_path,
+            'reloads': self.reloads,
+            'cookies': self.cookies,
+            'expires_at': self.expires_at,
+            'successes': self.successes,
+            'failures': self.failures,
+            'auth_failures': self.auth_failures,
+            'score': round(self.score, 3),
+            'quarantined': self.is_quarantined(now),
+            'quarantined_for': max(int(self.quarantined_until - now), 0),
+        }
+
+
+class CookiePool:
+    """
+    Cookie jars per platform, handed out in rotation
+
+    Every `*.txt` file in a platform's cookie directory (plus the legacy
+    single file from platform_configs) is one jar, i.e. one account. Files
+    are parsed and validated once at load time instead of being checked on
+    every request. Jars are handed out round-robin or least-recently-used;
+    a jar that hits `quarantine_after` bot checks / login walls in a row is
+    taken out of rotation for `quarantine_seconds`.
+
+    With start_watching() running, added, changed and removed files are
+    picked up without a restart: a changed file is parsed and snapshotted
+    first and then swapped into its jar in place, so requests never see a
+    half-written file. `on_swap` is called with each retired active path
+    (e.g. to drop warm YoutubeDL instances that parsed the old version).
+    A retired snapshot is deleted once no extraction has it checked out.
+    """
+
+    def __init__(self, sources: Dict[str, Iterable[str]], selection: str = 'round_robin',
+                 quarantine_after: int = 3, quarantine_seconds: int = 1800,
+                 snapshot_dir: Optional[str] = None, on_swap: Optional[Callable[[str], None]] = None):
+        if selection not in ('round_robin', 'lru'):
+            raise ValueError(f"Unknown cookie selection: {selection}. Choose from: round_robin, lru")
+
+        self.sources = {platform: list(paths) for platform, paths in sources.items()}
+        self.selection = selection
+        self.quarantine_after = quarantine_after
+        self.quarantine_seconds = quarantine_seconds
+        self.snapshot_dir = snapshot_dir
+        self.on_swap = on_swap
+
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._jars: Dict[str, List[CookieJar]] = {}
+        self._next: Dict[str, int] = {}
+        self._unreadable: Dict[str, Tuple[int, int]] = {}
+        self._refs: Dict[str, int] = {}
+        self._retired: set = set()
+        self._watcher: Optional[threading.Thread] = None
+        if snapshot_dir:
+            self._prune_snapshots()
+        self.load()
+
+    def _prune_snapshots(self):
+        """Remove the snapshot directories of processes that are gone"""
+        try:
+            entries = os.listdir(self.snapshot_dir)
+        except OSError:
+            return
+
+        for entry in entries:
+            if not entry.isdigit() or int(entry) == os.getpid():
+                continue
+            try:
+                os.kill(int(entry), 0)
+                continue  # Still running
+            except ProcessLookupError:
+                pass
+            except OSError:
+                continue  # Running under another user
+            shutil.rmtree(os.path.join(self.snapshot_dir, entry), ignore_errors=True)
+
+    def _discover(self, platform: str) -> List[str]:
+        """Cookie files for a platform: plain files as-is, directories expanded to their *.txt files"""
+        paths = []
+        for source in self.sources.get(platform, []):
+            if os.path.isdir(source):
+                paths.extend(sorted(glob.glob(os.path.join(source, '*.txt'))))
+            elif os.path.isfile(source):
+                paths.append(source)
+        return list(dict.fromkeys(os.path.abspath(path) for path in paths))
+
+    def load(self) -> bool:
+        """
+        (Re)load every platform's jars
+
+        Unchanged files (same mtime and size) are not parsed again. A file that
+        cannot be parsed (e.g. caught mid-write) keeps its previous version.
+
+        Returns:
+            True if any jar was added, swapped or removed
+        """
+        changed = False
+        with self._load_lock:
+            for platform in self.sources:
+                changed |= self._load_platform(platform)
+        return changed
+
+    def _load_platform(self, platform: str) -> bool:
+        with self._lock:
+            known = {jar.path: jar for jar in self._jars.get(platform, [])}
+
+        jars = []
+        retired = []
+        for path in self._discover(platform):
+            jar = known.pop(path, None)
+            try:
+                signature = _signature(path)
+                if (jar is not None and jar.signature == signature) or self._unreadable.get(path) == signature:
+                    if jar is not None:
+                        jars.append(jar)
+                    continue
+                fresh = (jar or CookieJar(platform, path)).parse(self.snapshot_dir)
+            except (OSError, http.cookiejar.LoadError) as e:
+                logger.warning(f"Skipping unreadable cookie file {path}: {e}")
+                try:
+                    self._unreadable[path] = _signature(path)  # Not retried until the file changes again
+                except OSError:
+                    pass
+                if jar is not None and jar.signature is not None:
+                    jars.append(jar)  # Keep serving the last good version
+                continue
+            self._unreadable.pop(path, None)
+
+            if jar is None:
+                jar = CookieJar(platform, path)
+                logger.info(f"🍪 Added cookie jar {path}")
+            else:
+                retired.append(jar.active_path)
+                logger.info(f"🍪 Reloaded cookie jar {path}")
+            jars.append(jar)
+
+            # Swap the new version in; a refreshed jar gets a clean slate
+            with self._lock:
+                if jar.signature is not None:
+                    jar.reloads += 1
+                    jar.quarantined_until = 0.0
+                    jar.consecutive_auth_failures = 0
+                for field, value in fresh.items():
+                    setattr(jar, field, value)
+
+        for jar in known.values():
+            logger.info(f"🍪 Removed cookie jar {jar.path}")
+            retired.append(jar.active_path)
+
+        with self._lock:
+            previous = self._jars.get(platform)
+            self._jars[platform] = jars
+
+        for active_path in retired:
+            self._retire(active_path)
+
+        if previous is None and not jars:
+            logger.warning(f"No cookie files for {platform}, proceeding without cookies")
+        return bool(retired) or previous is None or len(jars) != len(previous)
+
+    def _retire(self, active_path: str):
+        """Forget an old version of a jar"""
+        if self.on_swap is not None:
+            try:
+                self.on_swap(active_path)
+            except Exception as e:
+                logger.warning(f"Cookie swap callback failed for {active_path}: {e}")
+
+        if self.snapshot_dir and os.path.abspath(active_path).startswith(os.path.abspath(self.snapshot_dir)):
+            with self._lock:
+                if self._refs.get(active_path):
+                    self._retired.add(active_path)  # Deleted by the last release
+                    return
+            self._remove_snapshot(active_path)
+
+    @staticmethod
+    def _remove_snapshot(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _watch_dirs(self) -> List[str]:
+        directories = []
+        for sources in self.sources.values():
+            for source in sources:
+                directory = source if os.path.isdir(source) else os.path.dirname(os.path.abspath(source))
+                if os.path.isdir(directory):
+                    directories.append(os.path.abspath(directory))
+        return list(dict.fromkeys(directories))
+
+    def start_watching(self, interval: float = 5):
+        """
+        Reload jars whenever cookie files change
+
+        Uses inotify when the `inotify_simple` package is installed and falls
+        back to checking mtimes every `interval` seconds.
+
+        Args:
+            interval: Polling interval (also the longest inotify wait)
+        """
+        if self._watcher is not None:
+            return
+
+        self._watcher = threading.Thread(target=self._watch_loop, args=(interval,),
+                                         name='cookie-watcher', daemon=True)
+        self._watcher.start()
+
+    def _watch_loop(self, interval: float):
+        inotify = None
+        if inotify_simple is not None:
+            try:
+                inotify = inotify_simple.INotify()
+                mask = (inotify_simple.flags.CLOSE_WRITE | inotify_simple.flags.MOVED_TO |
+                        inotify_simple.flags.CREATE | inotify_simple.flags.DELETE)
+                for directory in self._watch_dirs():
+                    inotify.add_watch(directory, mask)
+                logger.info("🍪 Watching cookie files with inotify")
+            except OSError as e:
+                logger.warning(f"inotify unavailable ({e}), polling cookie files instead")
+                inotify = None
+        if inotify is None:
+            logger.info(f"🍪 Polling cookie files every {interval}s")
+
+        while True:
+            try:
+                if inotify is not None:
+                    # Rescan on events, and on the timeout too (new platform directories are not watched)
+                    if inotify.read(timeout=int(interval * 1000)):
+                        time.sleep(0.2)  # let a burst of writes settle
+                else:
+                    time.sleep(interval)
+                self.load()
+            except Exception as e:
+                logger.error(f"Cookie reload failed: {e}")
+                time.sleep(interval)
+
+    def acquire(self, platform: str) -> Optional[CookieJar]:
+        """
+        Pick the cookie jar for the next extraction
+
+        Args:
+            platform: Platform name
+
+        Returns:
+            A jar outside quarantine, or None when there is none (extract without cookies)
+        """
+        now = time.time()
+        with self._lock:
+            jars = self._jars.get(platform) or []
+            healthy = [jar for jar in jars if not jar.is_quarantined(now)]
+            if not healthy:
+                return None
+
+            if self.selection == 'lru':
+                jar = min(healthy, key=lambda j: j.last_used)
+            else:
+                index = self._next.get(platform, 0)
+                jar = healthy[index % len(healthy)]
+                self._next[platform] = index + 1
+
+            jar.last_used = now
+            return jar
+
+    def checkout(self, jar: CookieJar) -> str:
+        """
+        Pin the jar's current version for an extraction
+
+        Args:
+            jar: Jar returned by acquire
+
+        Returns:
+            The path to hand to yt-dlp; it stays on disk until released
+        """
+        with self._lock:
+            path = jar.active_path
+            self._refs[path] = self._refs.get(path, 0) + 1
+            return path
+
+    def retain(self, path: str):
+        """Pin an already checked-out path once more (e.g. for one attempt)"""
+        with self._lock:
+            self._refs[path] = self._refs.get(path, 0) + 1
+
+    def release(self, path: str):
+        """
+        Unpin a path from checkout or retain, deleting it if it was retired meanwhile
+
+        Args:
+            path: Path returned by checkout
+        """
+        with self._lock:
+            refs = self._refs.get(path, 0) - 1
+            if refs > 0:
+                self._refs[path] = refs
+                return
+            self._refs.pop(path, None)
+            if path not in self._retired:
+                return
+            self._retired.discard(path)
+        self._remove_snapshot(path)
+
+    def record(self, jar: CookieJar, success: bool, auth_failure: bool = False):
+        """
+        Record the outcome of an extraction that used a jar
+
+        Args:
+            jar: Jar returned by acquire
+            success: Whether the extraction succeeded
+            auth_failure: Whether it failed on a bot check / login wall (counts towards quarantine)
+        """
+        with self._lock:
+            if success:
+                jar.successes += 1
+                jar.consecutive_auth_failures = 0
+                return
+
+            jar.failures += 1
+            if not auth_failure:
+                return
+
+            jar.auth_failures += 1
+            jar.consecutive_auth_failures += 1
+            if jar.consecutive_auth_failures >= self.quarantine_after:
+                jar.quarantined_until = time.time() + self.quarantine_seconds
+                jar.consecutive_auth_failures = 0
+                logger.warning(f"🍪 Quarantined cookie jar {jar.path} for {self.quarantine_seconds}s "
+                               f"after repeated bot checks")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Jars and their health per platform"""
+        now = time.time()
+        with self._lock:
+            return {
+                'selection': self.selection,
+                'platforms': {
+                    platform: [jar.to_dict(now) for jar in jars]
+                    for platform, jars in self._jars.items()
+                }
+            }
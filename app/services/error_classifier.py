@@ -0,0 +1,111 @@
+"""
+Extraction Error Classifier
+Sorts yt-dlp failures into retryable, auth-related and permanent
+(plus throttled: extractions our own rate scheduler refused to start)
+"""
+import re
+import subprocess
+from typing import Optional
+
+ERROR_RETRYABLE = 'retryable'  # network trouble, 5xx, throttling: worth another attempt
+ERROR_AUTH = 'auth'            # bot checks, cookies, login walls: another strategy may work
+ERROR_PERMANENT = 'permanent'  # the video itself is gone or unsupported: stop immediately
+ERROR_THROTTLED = 'throttled'  # never attempted, the rate scheduler's queue was full: come back later
+
+# Checked in this order; the first match wins
+_PATTERNS = [
+    # Transient outages worded like removals ("Video unavailable. ... try again later")
+    (ERROR_RETRYABLE, re.compile(r'try again later|temporarily unavailable', re.IGNORECASE)),
+    # Region locks read like "Video unavailable" but the geo-bypass strategies may get through
+    (ERROR_AUTH, re.compile(r'available in your country|geo[- ]?restrict', re.IGNORECASE)),
+    (ERROR_PERMANENT, re.compile('|'.join([
+        r'video unavailable',
+        r'private video',
+        r'unsupported url',
+        r'is not a valid url',
+        r'video (?:has been|was) removed',
+        r'no longer available',
+        r'account (?:associated with this video )?has been terminated',
+        r'copyright (?:claim|grounds)',
+        r'removed for violating',
+        r'http error 404',
+        r'http error 410',
+    ]), re.IGNORECASE)),
+    (ERROR_AUTH, re.compile('|'.join([
+        r'sign in to',
+        r'not a bot',
+        r'use --cookies',
+        r'cookies (?:are|have) (?:expired|no longer valid|invalid)',
+        r'log ?in required',
+        r'requires? (?:a )?log ?in',
+        r'log ?in to',
+        r'members[- ]only',
+        r'join this channel',
+        r'confirm your age',
+        r'age[- ]restricted',
+        r'inappropriate for some users',
+        r'checkpoint',
+        r'http error 401',
+        r'http error 403',
+    ]), re.IGNORECASE)),
+    (ERROR_RETRYABLE, re.compile('|'.join([
+        r'timed? ?out',
+        r'http error 5\d\d',
+        r'http error 429',
+        r'too many requests',
+        r'rate[- ]limit',
+        r'temporar(?:y|ily)',
+        r'connection (?:reset|refused|aborted)',
+        r'network',
+        r'name or service not known',
+        r'unable to download',
+        r'incomplete read',
+    ]), re.IGNORECASE)),
+]
+
+
+class ExtractionError(str):
+    """
+    Error message that also carries its classification
+
+    Behaves like the plain error strings returned by the extraction methods,
+    so existing callers keep working, while callers that care can read
+    `error_type`, and `retry_after` (seconds) when the failure was served
+    fast by the negative cache, a circuit breaker or the rate scheduler.
+    """
+
+    error_type: str
+    retry_after: Optional[int]
+
+    def __new__(cls, message: str, error_type: str, retry_after: Optional[int] = None):
+        error = super().__new__(cls, message)
+        error.error_type = error_type
+        error.retry_after = retry_after
+        return error
+
+
+def classify_error(error: Optional[str], exception: Optional[BaseException] = None) -> str:
+    """
+    Classify an extraction failure
+
+    Args:
+        error: Error message (yt-dlp stderr or exception text)
+        exception: The exception raised by the engine, if any
+
+    Returns:
+        ERROR_RETRYABLE, ERROR_AUTH or ERROR_PERMANENT (ERROR_THROTTLED is only
+        ever set directly on an ExtractionError)
+    """
+    error_type = getattr(error, 'error_type', None)
+    if error_type:
+        return error_type
+
+    if isinstance(exception, (TimeoutError, subprocess.TimeoutExpired, ConnectionError)):
+        return ERROR_RETRYABLE
+
+    for error_type, pattern in _PATTERNS:
+        if error and pattern.search(error):
+            return error_type
+
+    # Unknown failures keep the old behaviour of being retried
+    return ERROR_RETRYABLE
@@ -0,0 +1,344 @@
+"""
+yt-dlp Extraction Engines
+Runs yt-dlp metadata extraction either in-process or as a subprocess
+"""
+import subprocess
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+from config.settings import config as settings
+from app.services import player_cache
+
+logger = logging.getLogger(__name__)
+
+CANCELLED_ERROR = 'Extraction cancelled'
+
+
+@lru_cache(maxsize=None)
+def ytdlp_version() -> Optional[str]:
+    """
+    Installed yt-dlp version, read in-process
+
+    Checked once per process instead of launching `python -m yt_dlp --version`;
+    when the gunicorn master has read it (--preload) every forked worker
+    inherits the answer.
+
+    Returns:
+        Version string, or None if yt-dlp cannot be imported
+    """
+    try:
+        from yt_dlp.version import __version__
+    except ImportError as e:
+        logger.error(f"yt-dlp is not importable: {e}")
+        return None
+    return __version__
+
+
+def preload_ytdlp(platforms: Optional[Dict[str, Dict[str, Any]]] = None,
+                  fixture: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Import yt-dlp and warm it up
+
+    Run in the gunicorn master under --preload, so forked workers share the
+    warm state copy-on-write instead of each building it on their first
+    request: the extractor registry is loaded, every extractor's URL regexes
+    are compiled (yt-dlp tries them in turn to pick an extractor), the
+    platforms' extractors are instantiated and, with a fixture, one dry
+    extraction runs through the whole info pipeline without network access.
+
+    Args:
+        platforms: Per platform, the extractor 'keys' and a 'sample_url' they match
+        fixture: Optional local HTML page for the dry extraction
+
+    Returns:
+        Summary: extractor count, extractor matched per platform, dry run time
+    """
+    import yt_dlp
+    from yt_dlp.extractor import gen_extractor_classes
+
+    extractor_classes = list(gen_extractor_classes())  # in the order yt-dlp tries them
+    summary: Dict[str, Any] = {'version': ytdlp_version(), 'extractors': len(extractor_classes), 'platforms': {}}
+
+    ydl = yt_dlp.YoutubeDL(build_ydl_options(['--no-warnings', '--enable-file-urls']))
+    ydl.params['logger'] = _CaptureLogger()
+    for platform, spec in (platforms or {}).items():
+        matched = None
+        for cls in extractor_classes:
+            if cls.suitable(spec['sample_url']):
+                matched = matched or cls.ie_key()
+        for key in spec['keys']:
+            try:
+                ydl.get_info_extractor(key)
+            except Exception as e:
+                logger.warning(f"Could not load yt-dlp extractor {key} for {platform}: {e}")
+        summary['platforms'][platform] = matched
+
+    if fixture:
+        started = time.monotonic()
+        try:
+            ydl.extract_info('file://' + os.path.abspath(fixture), download=False)
+            summary['dry_run_seconds'] = round(time.monotonic() - started, 3)
+        except Exception as e:
+            logger.warning(f"Warmup extraction of {fixture} failed: {e}")
+            summary['dry_run_error'] = str(e)
+
+    return summary
+
+
+def build_ydl_options(args: List[str]) -> Dict[str, Any]:
+    """
+    Translate yt-dlp command line arguments into a YoutubeDL option dict
+
+    Args:
+        args: yt-dlp CLI arguments (without the URL)
+
+    Returns:
+        Option dict suitable for yt_dlp.YoutubeDL
+    """
+    import yt_dlp
+
+    options = yt_dlp.parse_options(list(args)).ydl_opts
+    # Metadata only: never touch the filesystem and never print to stdout
+    options.update({
+        'quiet': True,
+        'noprogress': True,
+        'simulate': True,
+        'skip_download': True,
+    })
+    return options
+
+
+class _CaptureLogger:
+    """
+    YoutubeDL logger that keeps the last error message of a run
+
+    yt-dlp reports every extraction step through debug(), which makes it the
+    place to abort a run whose cancel event has been set or whose deadline
+    (time.monotonic() value) has passed.
+    """
+
+    def __init__(self):
+        self.errors: List[str] = []
+        self.cancel: Optional[threading.Event] = None
+        self.deadline: Optional[float] = None
+
+    def reset(self, cancel: Optional[threading.Event] = None, deadline: Optional[float] = None):
+        self.errors = []
+        self.cancel = cancel
+        self.deadline = deadline
+
+    @property
+    def timed_out(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def debug(self, msg):
+        if (self.cancel is not None and self.cancel.is_set()) or self.timed_out:
+            from yt_dlp.utils import DownloadCancelled
+            raise DownloadCancelled(CANCELLED_ERROR)  # re-raised even with --ignore-errors
+
+    def info(self, msg):
+        pass
+
+    def warning(self, msg):
+        logger.debug(f"yt-dlp warning: {msg}")
+
+    def error(self, msg):
+        self.errors.append(msg)
+
+    @property
+    def last_error(self) -> Optional[str]:
+        return self.errors[-1] if self.errors else None
+
+
+class SubprocessEngine:
+    """Runs every extraction in a fresh `python -m yt_dlp` process (full isolation)"""
+
+    name = 'subprocess'
+
+    def extract(self, url: str, args: List[str], timeout: int,
+                cancel: Optional[threading.Event] = None) -> Tuple[bool, Optional[Dict], Optional[str]]:
+        """
+        Extract metadata for a single URL
+
+        Args:
+            url: The video URL
+            args: yt-dlp CLI arguments (without the URL)
+            timeout: Seconds before the subprocess is killed
+            cancel: Optional event; the subprocess is killed once it is set
+
+        Returns:
+            Tuple of (success, metadata, error message)
+        """
+        cmd = [sys.executable, '-m', 'yt_dlp', '--dump-json'] + list(args) + [url]
+        deadline = time.monotonic() + timeout
+
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        while True:
+            try:
+                stdout, stderr = process.communicate(timeout=0.5)
+                break
+            except subprocess.TimeoutExpired:
+                if cancel is not None and cancel.is_set():
+                    process.kill()
+                    process.communicate()
+                    return False, None, CANCELLED_ERROR
+                if time.monotonic() >= deadline:
+                    process.kill()
+                    process.communicate()
+                    raise subprocess.TimeoutExpired(cmd, timeout)
+
+        if process.returncode == 0:
+            return True, json.loads(stdout), None
+        return False, None, stderr.strip()
+
+
+class InProcessEngine:
+    """
+    Runs extractions inside the current process
+
+    Keeps long-lived YoutubeDL instances per option set so the interpreter
+    startup, yt-dlp import and extractor registry load are paid only once.
+    Instances are checked out per call, so they are never shared between threads.
+    """
+
+    name = 'inprocess'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._idle: Dict[Tuple[str, ...], List[Any]] = {}
+        self._epoch = 0
+        self._retired: Dict[str, int] = {}
+
+    def _checkout(self, key: Tuple[str, ...]):
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop()
+            epoch = self._epoch
+
+        import yt_dlp
+
+        options = build_ydl_options(list(key))
+        options['logger'] = _CaptureLogger()
+        ydl = yt_dlp.YoutubeDL(options)
+        ydl._engine_epoch = epoch
+        player_cache.instrument(ydl)
+        return ydl
+
+    def _checkin(self, key: Tuple[str, ...], ydl):
+        with self._lock:
+            # Instance built from a file that has been swapped out while it was in use
+            if any(self._retired.get(arg, -1) >= ydl._engine_epoch for arg in key):
+                return
+            self._idle.setdefault(key, []).append(ydl)
+
+    def discard(self, path: str):
+        """
+        Drop warm instances whose options reference a file (e.g. a replaced cookie jar)
+
+        Instances are released without close(), which would write their stale
+        cookies back over the file. Instances currently in use are dropped when
+        they are checked back in.
+
+        Args:
+            path: File path as it appears in the yt-dlp arguments
+        """
+        with self._lock:
+            self._retired[path] = self._epoch
+            self._epoch += 1
+            stale = [key for key in self._idle if path in key]
+            for key in stale:
+                del self._idle[key]
+
+        if stale:
+            logger.info(f"Dropped warm yt-dlp instances for {path}")
+
+    def extract(self, url: str, args: List[str], timeout: int,
+                cancel: Optional[threading.Event] = None) -> Tuple[bool, Optional[Dict], Optional[str]]:
+        """
+        Extract metadata for a single URL
+
+        Args:
+            url: The video URL
+            args: yt-dlp CLI arguments (without the URL)
+            timeout: Seconds before the run is stopped at its next extraction step
+                (a single blocking request is still bounded by yt-dlp's socket_timeout)
+            cancel: Optional event; the run stops at its next extraction step once it is set
+
+        Returns:
+            Tuple of (success, metadata, error message)
+        """
+        from yt_dlp.utils import DownloadCancelled, DownloadError
+
+        key = tuple(args)
+        ydl = self._checkout(key)
+        capture = ydl.params['logger']
+        capture.reset(cancel, time.monotonic() + timeout if timeout else None)
+
+        try:
+            info = ydl.extract_info(url, download=False)
+            if info is None:
+                # --ignore-errors swallows the exception and only logs it
+                return False, None, capture.last_error or 'yt-dlp returned no data'
+
+            # Match what --dump-json prints
+            ydl.post_extract(info)
+            info.setdefault('_filename', ydl.prepare_filename(info))
+            info.setdefault('filename', info['_filename'])
+            return True, ydl.sanitize_info(info), None
+
+        except DownloadCancelled:
+            if capture.timed_out and not (cancel is not None and cancel.is_set()):
+                raise TimeoutError(f"Extraction timed out after {timeout} seconds")
+            return False, None, CANCELLED_ERROR
+        except DownloadError as e:
+            return False, None, capture.last_error or str(e)
+        finally:
+            capture.reset()
+            self._checkin(key, ydl)
+
+    def clear(self):
+        """Drop all cached YoutubeDL instances"""
+        with self._lock:
+            instances = [ydl for idle in self._idle.values() for ydl in idle]
+            self._idle.clear()
+
+        for ydl in instances:
+            try:
+                ydl.close()
+            except Exception as e:
+                logger.debug(f"Error closing YoutubeDL instance: {e}")
+
+
+def create_engine(name: str):
+    """
+    Create an extraction engine by name
+
+    Args:
+        name: 'inprocess', 'subprocess' or 'pool'
+
+    Returns:
+        Engine instance
+    """
+    from app.services.worker_pool import WorkerPoolEngine
+
+    engines = {
+        InProcessEngine.name: InProcessEngine,
+        SubprocessEngine.name: SubprocessEngine,
+        WorkerPoolEngine.name: lambda: WorkerPoolEngine(
+            size=settings.YTDLP_POOL_SIZE,
+            max_jobs=settings.YTDLP_POOL_MAX_JOBS,
+            max_rss_mb=settings.YTDLP_POOL_MAX_RSS_MB,
+            start_method=settings.YTDLP_POOL_START_METHOD,
+        ),
+    }
+
+    if name not in engines:
+        raise ValueError(f"Unknown yt-dlp engine: {name}. Choose from: {', '.join(engines)}")
+
+    return engines[name]()
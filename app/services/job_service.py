@@ -0,0 +1,310 @@
+"""
+Background Job Service
+Asynchronous extraction jobs with a persisted queue, polling and webhooks
+"""
+import http.client
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional
+from urllib.parse import urlsplit
+
+from app.utils.projection import parse_field_paths
+from app.utils.response import build_result, requested_fields
+from app.utils.validators import resolve_callback_address
+from config.settings import config as settings
+
+logger = logging.getLogger(__name__)
+
+STATUS_QUEUED = 'queued'
+STATUS_RUNNING = 'running'
+STATUS_SUCCEEDED = 'succeeded'
+STATUS_FAILED = 'failed'
+
+
+def _pid_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobManager:
+    """
+    Runs extraction jobs on a background executor
+
+    Jobs are persisted in SQLite, so a job submitted to one worker survives
+    that worker's restart: every job records the process that owns it, and
+    jobs (queued or running) whose owner is gone are adopted by the periodic
+    sweep of any worker. Claiming a job is a single conditional UPDATE, so
+    each job runs in exactly one worker.
+    """
+
+    def __init__(self, service, db_path: str, max_workers: int = 4,
+                 result_ttl: int = 86400, sweep_interval: int = 30):
+        self.service = service
+        self.db_path = db_path
+        self.result_ttl = result_ttl
+        self.sweep_interval = sweep_interval
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._submitted = set()  # Jobs sitting in (or running on) this process's executor
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS jobs ('
+                'id TEXT PRIMARY KEY, url TEXT NOT NULL, options TEXT NOT NULL, callback_url TEXT, '
+                'status TEXT NOT NULL, result TEXT, error TEXT, owner_pid INTEGER, '
+                'created_at REAL NOT NULL, updated_at REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, updated_at)')
+
+        self._sweeper = threading.Thread(target=self._sweep_loop, name='job-sweeper', daemon=True)
+        self._sweeper.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    def submit(self, url: str, fields: str = '', exclude: str = '',
+               callback_url: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Queue an extraction job
+
+        Args:
+            url: Sanitized video URL
+            fields: Optional `fields=` projection
+            exclude: Optional `exclude=` projection
+            callback_url: Optional URL notified with a POST when the job finishes
+
+        Returns:
+            The job record
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        options = json.dumps({'fields': fields or '', 'exclude': exclude or ''})
+
+        with self._lock:
+            self._submitted.add(job_id)  # Before the row exists, so the sweep never takes it for an orphan
+
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                'INSERT INTO jobs (id, url, options, callback_url, status, owner_pid, created_at, updated_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (job_id, url, options, callback_url, STATUS_QUEUED, os.getpid(), now, now)
+            )
+
+        self._executor.submit(self._run, job_id)
+        logger.info(f"Queued job {job_id} for {url}")
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a job
+
+        Args:
+            job_id: Job ID returned by submit
+
+        Returns:
+            Job record with status, and result or error once finished; None if unknown
+        """
+        row = self._connect().execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        if row is None:
+            return None
+
+        job = {
+            'id': row['id'],
+            'url': row['url'],
+            'status': row['status'],
+            'created_at': row['created_at'],
+            'updated_at': row['updated_at'],
+        }
+        if row['status'] == STATUS_SUCCEEDED:
+            job['result'] = json.loads(row['result'])
+        elif row['status'] == STATUS_FAILED:
+            job['error'] = row['error']
+        return job
+
+    def _enqueue(self, job_id: str):
+        with self._lock:
+            self._submitted.add(job_id)
+        self._executor.submit(self._run, job_id)
+
+    def _claim(self, job_id: str) -> Optional[sqlite3.Row]:
+        conn = self._connect()
+        with conn:
+            claimed = conn.execute(
+                'UPDATE jobs SET status = ?, owner_pid = ?, updated_at = ? WHERE id = ? AND status = ?',
+                (STATUS_RUNNING, os.getpid(), time.time(), job_id, STATUS_QUEUED)
+            ).rowcount
+        if not claimed:
+            return None
+        return conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+
+    def _run(self, job_id: str):
+        try:
+            self._execute(job_id)
+        finally:
+            with self._lock:
+                self._submitted.discard(job_id)
+
+    def _execute(self, job_id: str):
+        row = self._claim(job_id)
+        if row is None:
+            return  # Already taken by another worker
+
+        options = json.loads(row['options'])
+        fields = parse_field_paths(options['fields'])
+        excluded = parse_field_paths(options['exclude'])
+        url = row['url']
+
+        try:
+            platform = self.service.detect_platform(url)
+            skip = self.service.prunable_sections(requested_fields(fields, excluded))
+            success, metadata, error = self.service.extract_metadata_raw(url, skip=skip)
+            result = build_result(metadata, url, platform, fields, excluded) if success else None
+        except Exception as e:
+            logger.error(f"Job {job_id} crashed: {e}")
+            success, result, error = False, None, f"Internal error: {e}"
+
+        status = STATUS_SUCCEEDED if success else STATUS_FAILED
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                'UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ? WHERE id = ?',
+                (status, json.dumps(result) if success else None,
+                 None if success else (error or 'Extraction failed'), time.time(), job_id)
+            )
+        logger.info(f"Job {job_id} {status}")
+
+        if row['callback_url']:
+            self._notify(row['callback_url'], self.get(job_id))
+
+    def _notify(self, callback_url: str, job: Dict[str, Any], attempts: int = 3):
+        """
+        POST the finished job to its callback URL, retrying with backoff
+
+        The host is resolved and checked again before every attempt (it was
+        checked at submit time, but DNS may have changed since) and the
+        connection goes to the checked address. Redirects are not followed.
+        """
+        body = json.dumps(job).encode('utf-8')
+        parts = urlsplit(callback_url)
+        path = (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+
+        for attempt in range(attempts):
+            if attempt:
+                time.sleep(2 ** (attempt - 1))
+
+            address = resolve_callback_address(callback_url, settings.JOBS_CALLBACK_ALLOWLIST)
+            if address is None:
+                logger.error(f"Refusing callback for job {job['id']}: {parts.hostname} is not a public, allowed host")
+                return
+
+            connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+            conn = connection_class(parts.hostname, parts.port, timeout=10)
+            # Connect to the checked address; Host header and TLS name still use the hostname
+            conn._create_connection = lambda target, *args, **kwargs: socket.create_connection(
+                (address, target[1]), *args, **kwargs)
+            try:
+                conn.request('POST', path, body=body, headers={
+                    'Content-Type': 'application/json', 'User-Agent': 'ytdlp-extractor-jobs'
+                })
+                status = conn.getresponse().status
+                if status < 300:
+                    return
+                logger.warning(f"Callback for job {job['id']} got HTTP {status} (attempt {attempt + 1})")
+            except Exception as e:
+                logger.warning(f"Callback for job {job['id']} failed (attempt {attempt + 1}): {e}")
+            finally:
+                conn.close()
+
+        logger.error(f"Giving up on callback for job {job['id']}: {callback_url}")
+
+    def _sweep_loop(self):
+        while True:
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.error(f"Job sweep failed: {e}")
+            time.sleep(self.sweep_interval)
+
+    def _is_orphan(self, job_id: str, owner_pid: Optional[int]) -> bool:
+        """Whether no live executor holds a queued or running job"""
+        with self._lock:
+            if job_id in self._submitted:
+                return False
+        if owner_pid == os.getpid():
+            return True  # Left by an earlier process that had the same PID (e.g. a restarted container)
+        return not _pid_alive(owner_pid)
+
+    def sweep(self):
+        """Adopt orphaned jobs and purge expired results"""
+        conn = self._connect()
+        now = time.time()
+        adopted = []
+
+        with conn:
+            rows = conn.execute(
+                'SELECT id, status, owner_pid FROM jobs WHERE status IN (?, ?)', (STATUS_QUEUED, STATUS_RUNNING)
+            ).fetchall()
+            for row in rows:
+                if not self._is_orphan(row['id'], row['owner_pid']):
+                    continue
+                taken = conn.execute(
+                    'UPDATE jobs SET status = ?, owner_pid = ?, updated_at = ? '
+                    'WHERE id = ? AND status = ? AND owner_pid IS ?',
+                    (STATUS_QUEUED, os.getpid(), now, row['id'], row['status'], row['owner_pid'])
+                ).rowcount
+                if taken:
+                    adopted.append(row['id'])
+                    logger.info(f"Adopted {row['status']} job {row['id']} from dead worker {row['owner_pid']}")
+
+            conn.execute(
+                'DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?',
+                (STATUS_SUCCEEDED, STATUS_FAILED, now - self.result_ttl)
+            )
+
+        for job_id in adopted:
+            self._enqueue(job_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Job counts by status"""
+        rows = self._connect().execute('SELECT status, COUNT(*) FROM jobs GROUP BY status').fetchall()
+        return {status: count for status, count in rows}
+
+
+_job_manager = None
+_job_lock = threading.Lock()
+
+def get_job_manager(service) -> JobManager:
+    """Shared job manager, created on first use"""
+    global _job_manager
+    with _job_lock:
+        if _job_manager is None:
+            _job_manager = JobManager(
+                service,
+                db_path=settings.JOBS_DB_PATH,
+                max_workers=settings.JOBS_MAX_WORKERS,
+                result_ttl=settings.JOBS_RESULT_TTL
+            )
+        return _job_manager
@@ -0,0 +1,312 @@
+"""
+Metadata Cache
+TTL cache for extraction results, keyed by (platform, canonical video ID)
+"""
+import json
+import logging
+import threading
+import time
+import zlib
+from typing import Dict, Any, Iterable, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+
+from app.services.cache_backends import CacheBackend, MemoryCacheBackend
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency, zlib is used instead
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# One-byte codec tag in front of every stored value, so workers configured
+# with different codecs can still read each other's entries
+_CODEC_TAGS = {'none': b'n', 'zlib': b'z', 'zstd': b's'}
+
+
+def signed_url_expiry(metadata: Dict[str, Any]) -> Optional[int]:
+    """
+    Find the earliest expiry timestamp among the signed media URLs
+
+    YouTube signs format URLs with `expire=<unix time>`, Facebook and
+    Instagram CDNs with `oe=<hex unix time>`.
+
+    Args:
+        metadata: Raw yt-dlp metadata
+
+    Returns:
+        Earliest expiry as a unix timestamp, or None if no URL carries one
+    """
+    urls = [metadata.get('url')] + [f.get('url') for f in metadata.get('formats') or []]
+    earliest = None
+
+    for url in urls:
+        if not url or ('expire=' not in url and 'oe=' not in url):
+            continue
+
+        query = parse_qs(urlparse(url).query)
+        try:
+            if query.get('expire'):
+                expires = int(query['expire'][0])
+            elif query.get('oe'):
+                expires = int(query['oe'][0], 16)
+            else:
+                continue
+        except ValueError:
+            continue
+
+        if earliest is None or expires < earliest:
+            earliest = expires
+
+    return earliest
+
+
+class MetadataCache:
+    """
+    Cache of extraction results with per-platform TTLs
+
+    Entries are stored as compressed JSON in a pluggable backend (in-process
+    LRU, SQLite file or Redis), which hands every caller its own copy and
+    lets all workers share results. The TTL of an entry is capped by the
+    expiry of its signed format URLs (minus a safety margin) so clients
+    never receive dead links.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend] = None, ttls: Optional[Dict[str, int]] = None,
+                 default_ttl: int = 1800, expiry_margin: int = 300, compression: str = 'zstd'):
+        self.backend = backend or MemoryCacheBackend()
+        self.ttls = ttls or {}
+        self.default_ttl = default_ttl
+        self.expiry_margin = expiry_margin
+
+        if compression == 'zstd' and zstandard is None:
+            logger.info("zstandard is not installed, compressing cache entries with zlib")
+            compression = 'zlib'
+        if compression not in _CODEC_TAGS:
+            raise ValueError(f"Unknown cache compression: {compression}. Choose from: {', '.join(_CODEC_TAGS)}")
+        self.compression = compression
+
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'stores': 0, 'errors': 0,
+                       'negative_hits': 0, 'negative_stores': 0,
+                       'raw_bytes_stored': 0, 'compressed_bytes_stored': 0}
+
+    def _encode(self, metadata: Dict[str, Any]) -> bytes:
+        raw = json.dumps(metadata, separators=(',', ':')).encode('utf-8')
+        if self.compression == 'zstd':
+            packed = zstandard.ZstdCompressor(level=3).compress(raw)
+        elif self.compression == 'zlib':
+            packed = zlib.compress(raw, 6)
+        else:
+            packed = raw
+
+        with self._lock:
+            self._stats['raw_bytes_stored'] += len(raw)
+            self._stats['compressed_bytes_stored'] += len(packed) + 1
+        return _CODEC_TAGS[self.compression] + packed
+
+    @staticmethod
+    def _decode(value: bytes) -> Dict[str, Any]:
+        tag, packed = value[:1], value[1:]
+        if tag == _CODEC_TAGS['zstd']:
+            if zstandard is None:
+                raise ValueError("zstd-compressed cache entry but zstandard is not installed")
+            raw = zstandard.ZstdDecompressor().decompress(packed)
+        elif tag == _CODEC_TAGS['zlib']:
+            raw = zlib.decompress(packed)
+        else:
+            raw = packed
+        return json.loads(raw)
+
+    @staticmethod
+    def _key(platform: str, video_id: str) -> str:
+        return f"meta:{platform}:{video_id}"
+
+    @staticmethod
+    def _failure_key(platform: str, video_id: str) -> str:
+        return f"fail:{platform}:{video_id}"
+
+    def ttl_for(self, platform: str, metadata: Dict[str, Any]) -> int:
+        """
+        Compute how long a result may be cached
+
+        Args:
+            platform: Platform name
+            metadata: Raw yt-dlp metadata
+
+        Returns:
+            TTL in seconds (0 or less means do not cache)
+        """
+        ttl = self.ttls.get(platform, self.default_ttl)
+
+        expires = signed_url_expiry(metadata)
+        if expires is not None:
+            ttl = min(ttl, int(expires - time.time()) - self.expiry_margin)
+
+        return ttl
+
+    def get(self, platform: str, video_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached extraction result
+
+        Args:
+            platform: Platform name
+            video_id: Canonical video ID
+
+        Returns:
+            A fresh copy of the cached metadata, or None on a miss
+        """
+        metadata = self._read(platform, video_id)
+        with self._lock:
+            self._stats['hits' if metadata is not None else 'misses'] += 1
+        return metadata
+
+    def get_first(self, platform: str, video_ids: Iterable[str]) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Look up several keys in order and return the first cached one
+
+        Counts as a single hit or miss, however many keys were tried.
+
+        Args:
+            platform: Platform name
+            video_ids: Cache keys, preferred first
+
+        Returns:
+            Tuple of (key that hit, fresh copy of its metadata), or (None, None) on a miss
+        """
+        for video_id in video_ids:
+            metadata = self._read(platform, video_id)
+            if metadata is not None:
+                with self._lock:
+                    self._stats['hits'] += 1
+                return video_id, metadata
+
+        with self._lock:
+            self._stats['misses'] += 1
+        return None, None
+
+    def _read(self, platform: str, video_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            value = self.backend.get(self._key(platform, video_id))
+            return self._decode(value) if value is not None else None
+        except Exception as e:
+            # A broken cache must never fail the request
+            logger.warning(f"Cache read failed for {platform}:{video_id}: {e}")
+            with self._lock:
+                self._stats['errors'] += 1
+            return None
+
+    def set(self, platform: str, video_id: str, metadata: Dict[str, Any]) -> bool:
+        """
+        Store an extraction result
+
+        Args:
+            platform: Platform name
+            video_id: Canonical video ID
+            metadata: Raw yt-dlp metadata
+
+        Returns:
+            True if the result was cached
+        """
+        ttl = self.ttl_for(platform, metadata)
+        if ttl <= 0:
+            return False
+
+        try:
+            value = self._encode(metadata)
+            self.backend.set(self._key(platform, video_id), value, ttl)
+        except Exception as e:
+            logger.warning(f"Cache write failed for {platform}:{video_id}: {e}")
+            with self._lock:
+                self._stats['errors'] += 1
+            return False
+
+        with self._lock:
+            self._stats['stores'] += 1
+        logger.debug(f"Cached {platform}:{video_id} for {ttl}s ({len(value)} bytes)")
+        return True
+
+    def get_failure(self, platform: str, video_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a recorded extraction failure (negative cache)
+
+        Args:
+            platform: Platform name
+            video_id: Canonical video ID
+
+        Returns:
+            The failure record stored by set_failure, or None
+        """
+        try:
+            value = self.backend.get(self._failure_key(platform, video_id))
+            failure = json.loads(value) if value is not None else None
+        except Exception as e:
+            logger.warning(f"Negative cache read failed for {platform}:{video_id}: {e}")
+            with self._lock:
+                self._stats['errors'] += 1
+            return None
+
+        if failure is not None:
+            with self._lock:
+                self._stats['negative_hits'] += 1
+        return failure
+
+    def set_failure(self, platform: str, video_id: str, failure: Dict[str, Any], ttl: int) -> bool:
+        """
+        Record an extraction failure so it is not retried for a while
+
+        Args:
+            platform: Platform name
+            video_id: Canonical video ID
+            failure: JSON-serializable failure record (error message, type, ...)
+            ttl: Seconds to keep the record
+
+        Returns:
+            True if the failure was recorded
+        """
+        if ttl <= 0:
+            return False
+
+        try:
+            self.backend.set(self._failure_key(platform, video_id), json.dumps(failure).encode('utf-8'), ttl)
+        except Exception as e:
+            logger.warning(f"Negative cache write failed for {platform}:{video_id}: {e}")
+            with self._lock:
+                self._stats['errors'] += 1
+            return False
+
+        with self._lock:
+            self._stats['negative_stores'] += 1
+        return True
+
+    def clear_failure(self, platform: str, video_id: str):
+        """Forget a recorded failure once the video extracts again"""
+        try:
+            self.backend.delete(self._failure_key(platform, video_id))
+        except Exception as e:
+            logger.warning(f"Negative cache delete failed for {platform}:{video_id}: {e}")
+
+    def delete(self, platform: str, video_id: str):
+        """Remove a single entry"""
+        self.backend.delete(self._key(platform, video_id))
+
+    def clear(self):
+        """Remove all entries"""
+        self.backend.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache counters for monitoring"""
+        with self._lock:
+            stats = dict(self._stats)
+
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else 0.0
+        stats['compression'] = self.compression
+        if stats['raw_bytes_stored']:
+            stats['compression_ratio'] = round(stats['compressed_bytes_stored'] / stats['raw_bytes_stored'], 3)
+
+        try:
+            stats.update(self.backend.get_stats())
+        except Exception as e:
+            stats['backend_error'] = str(e)
+        return stats
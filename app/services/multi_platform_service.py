@@ -2,28 +2,108 @@
 Multi-Platform yt-dlp Service
 Supports YouTube, Instagram, Facebook with platform-specific configurations
 """
-import subprocess
-import json
+import copy
+import itertools
 import logging
-import sys
-import re
-from typing import Dict, Any, Optional, Tuple
-from urllib.parse import urlparse
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Dict, Any, FrozenSet, Iterable, List, Optional, Tuple
+from config.settings import config as settings
+from app.services.extraction_engine import CANCELLED_ERROR, create_engine, build_ydl_options, ytdlp_version
+from app.services.error_classifier import (
+    ERROR_AUTH, ERROR_PERMANENT, ERROR_RETRYABLE, ERROR_THROTTLED, ExtractionError, classify_error
+)
+from app.services.cache_backends import create_cache_backend
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.cookie_pool import CookieJar, CookiePool
+from app.services.proxy_pool import ProxyPool, mask_proxy
+from app.services.metadata_cache import MetadataCache
+from app.services.player_cache import PlayerCache
+from app.services.rate_scheduler import RateScheduler
+from app.services.short_link_resolver import ShortLinkResolver, is_short_link
+from app.services.singleflight import SingleFlight
+from app.services.strategy_stats import StrategyStats
+from app.utils.platform_matcher import match_url
 
 logger = logging.getLogger(__name__)
 
+# yt-dlp extractors behind each platform, and a URL that selects them; warmed up before fork in preload mode
+PLATFORM_EXTRACTORS = {
+    'youtube': {
+        'keys': ['Youtube', 'YoutubeYtBe', 'YoutubeTab'],
+        'sample_url': 'https://www.youtube.com/watch?v=jNQXAC9IVRw',
+    },
+    'instagram': {
+        'keys': ['Instagram', 'InstagramIOS'],
+        'sample_url': 'https://www.instagram.com/p/C0000000000/',
+    },
+    'facebook': {
+        'keys': ['Facebook', 'FacebookReel', 'FacebookRedirectURL'],
+        'sample_url': 'https://www.facebook.com/watch/?v=10153231379946729',
+    },
+}
+
+# Parts of an extraction that can be skipped, and the top-level fields they produce
+PRUNABLE_SECTIONS = {
+    'captions': {'automatic_captions', 'subtitles', 'requested_subtitles'},
+    'formats': {
+        'formats', 'requested_formats', 'format', 'format_id', 'format_note', 'url', 'ext',
+        'width', 'height', 'resolution', 'aspect_ratio', 'fps', 'vcodec', 'acodec', 'vbr',
+        'abr', 'tbr', 'asr', 'filesize', 'filesize_approx', 'protocol', 'dynamic_range',
+        'audio_channels', 'video_ext', 'audio_ext', 'http_headers', 'downloader_options',
+        '_filename', 'filename',
+    },
+}
+
 class MultiPlatformYtDlpService:
     """Multi-platform service with different configurations per platform"""
     
     def __init__(self):
-        self.timeout = 90
+        self.timeout = settings.YTDLP_TIMEOUT
         self.max_retries = 3
-        self.ytdlp_available = self._check_ytdlp_installation()
+        self.ytdlp_version = ytdlp_version()
+        self.ytdlp_available = self.ytdlp_version is not None
+        if not self.ytdlp_available:
+            raise RuntimeError("yt-dlp is not available")
+        logger.info(f"yt-dlp found: {self.ytdlp_version}")
+        self.engine = create_engine(settings.YTDLP_ENGINE)
+        logger.info(f"Using yt-dlp engine: {self.engine.name}")
+        self.player_cache = PlayerCache(
+            settings.YTDLP_CACHE_DIR,
+            seed_dir=settings.YTDLP_CACHE_SEED_DIR or None
+        ) if settings.YTDLP_CACHE_DIR else None
+        self.cache = MetadataCache(
+            backend=create_cache_backend(
+                settings.METADATA_CACHE_BACKEND,
+                max_entries=settings.METADATA_CACHE_MAX_ENTRIES,
+                max_bytes=settings.METADATA_CACHE_MAX_MB * 1024 * 1024,
+                path=settings.METADATA_CACHE_PATH,
+                redis_url=settings.METADATA_CACHE_REDIS_URL
+            ),
+            ttls=settings.METADATA_CACHE_TTLS,
+            expiry_margin=settings.METADATA_CACHE_EXPIRY_MARGIN,
+            compression=settings.METADATA_CACHE_COMPRESSION
+        ) if settings.METADATA_CACHE_ENABLED else None
+        self.inflight = SingleFlight()
+        self._hedge_executor = ThreadPoolExecutor(max_workers=settings.HEDGE_MAX_THREADS, thread_name_prefix='hedge')
+        self._hedge_lock = threading.Lock()
+        self._hedge_stats = {'launched': 0, 'hedged': 0, 'cancelled': 0, 'wins': {}}
+        self.strategy_stats = StrategyStats(
+            window=settings.STRATEGY_STATS_WINDOW,
+            epsilon=settings.STRATEGY_EXPLORATION_RATE
+        )
+        # ✅ Bound on yt-dlp runs in this process, shared by requests, batches, jobs and hedges
+        self._extraction_slots = threading.BoundedSemaphore(settings.EXTRACTION_CONCURRENCY) \
+            if settings.EXTRACTION_CONCURRENCY > 0 else None
         
         # ✅ Platform-specific configurations
         self.platform_configs = {
             'youtube': {
                 'cookies': './www.youtube.com_cookies.txt',
+                'cookies_dir': os.path.join(settings.COOKIES_DIR, 'youtube'),
+                'proxies': settings.PROXIES['youtube'],
                 'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
                 'sleep_interval': '3',
                 'extra_args': [
@@ -37,35 +117,74 @@ class MultiPlatformYtDlpService:
             },
             'instagram': {
                 'cookies': './www.instagram.com_cookies.txt',
+                'cookies_dir': os.path.join(settings.COOKIES_DIR, 'instagram'),
+                'proxies': settings.PROXIES['instagram'],
                 'user_agent': 'Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1',
                 'sleep_interval': '3',
                 'extra_args': ['--extractor-args', 'instagram:api_type=graphql']
             },
             'facebook': {
                 'cookies': './www.facebook.com_cookies.txt',
+                'cookies_dir': os.path.join(settings.COOKIES_DIR, 'facebook'),
+                'proxies': settings.PROXIES['facebook'],
                 'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
                 'sleep_interval': '4',
                 'extra_args': []
             }
         }
         
-        if not self.ytdlp_available:
-            raise RuntimeError("yt-dlp is not available")
-    
-    def _check_ytdlp_installation(self) -> bool:
-        """Check if yt-dlp is properly installed"""
-        try:
-            result = subprocess.run(
-                [sys.executable, '-m', 'yt_dlp', '--version'], 
-                capture_output=True, text=True, timeout=10
+        # ✅ Cookie jars (one per account), parsed once and rotated across requests
+        self.cookie_pool = CookiePool(
+            sources={platform: [config['cookies'], config['cookies_dir']]
+                     for platform, config in self.platform_configs.items()},
+            selection=settings.COOKIE_SELECTION,
+            quarantine_after=settings.COOKIE_QUARANTINE_AFTER,
+            quarantine_seconds=settings.COOKIE_QUARANTINE_SECONDS,
+            snapshot_dir=settings.COOKIE_SNAPSHOT_DIR or None,
+            on_swap=getattr(self.engine, 'discard', None)
+        )
+        if settings.COOKIE_RELOAD_INTERVAL > 0:
+            # Refreshed cookie files are swapped in live, no restart needed
+            self.cookie_pool.start_watching(settings.COOKIE_RELOAD_INTERVAL)
+        
+        # ✅ Fail fast on platforms that keep failing, probe for recovery
+        self.breakers = {
+            platform: CircuitBreaker(
+                platform,
+                failure_threshold=settings.BREAKER_FAILURE_THRESHOLD,
+                reset_timeout=settings.BREAKER_RESET_TIMEOUT,
+                max_reset_timeout=settings.BREAKER_MAX_RESET_TIMEOUT
             )
-            if result.returncode == 0:
-                logger.info(f"yt-dlp found: {result.stdout.strip()}")
-                return True
-            return False
-        except Exception as e:
-            logger.error(f"yt-dlp check failed: {e}")
-            return False
+            for platform in self.platform_configs
+        }
+        
+        # ✅ Pace outbound extractions per platform at SCHEDULER_RATES requests per minute,
+        # with bursts allowed while a platform is idle (unpaced unless configured)
+        self.scheduler = RateScheduler(
+            rates={platform: settings.SCHEDULER_RATES.get(platform, 0) / 60.0
+                   for platform in self.platform_configs},
+            bursts=settings.SCHEDULER_BURSTS,
+            backend=settings.SCHEDULER_BACKEND,
+            path=settings.SCHEDULER_DB_PATH,
+            max_wait=settings.SCHEDULER_MAX_WAIT
+        )
+        
+        # ✅ Outbound proxies: one token bucket per (platform, proxy)
+        self.proxy_pool = ProxyPool(
+            {platform: config['proxies'] for platform, config in self.platform_configs.items()},
+            self.scheduler,
+            quarantine_after=settings.PROXY_QUARANTINE_AFTER,
+            quarantine_seconds=settings.PROXY_QUARANTINE_SECONDS,
+            sticky_cookies=settings.PROXY_STICKY_COOKIES
+        )
+        
+        # ✅ Short links resolved by their redirects, mappings kept next to the metadata
+        self.short_links = ShortLinkResolver(
+            backend=self.cache.backend if self.cache else None,
+            ttl=settings.SHORT_LINK_TTL,
+            timeout=settings.SHORT_LINK_TIMEOUT,
+            user_agent=self.platform_configs['facebook']['user_agent']
+        ) if settings.SHORT_LINK_RESOLVE else None
     
     def detect_platform(self, url: str) -> str:
         """
@@ -77,340 +196,604 @@ class MultiPlatformYtDlpService:
         Returns:
             Platform name: 'youtube', 'instagram', 'facebook', or 'unknown'
         """
-        try:
-            parsed_url = urlparse(url.lower())
-            domain = parsed_url.netloc
-            
-            # ✅ YouTube detection
-            youtube_domains = [
-                'youtube.com', 'www.youtube.com', 'm.youtube.com',
-                'youtu.be', 'www.youtu.be',
-                'youtube-nocookie.com', 'www.youtube-nocookie.com'
-            ]
-            
-            # ✅ Instagram detection
-            instagram_domains = [
-                'instagram.com', 'www.instagram.com', 'm.instagram.com',
-                'instagr.am', 'www.instagr.am'
-            ]
+        return match_url(url).platform
+    
+    def _primary_args(self, platform: str, config: Dict, jar: Optional[CookieJar] = None,
+                      cookies_path: Optional[str] = None) -> List[str]:
+        """
+        Build the yt-dlp arguments for a platform's primary (cookie based) configuration
+        
+        Args:
+            platform: Platform name
+            config: The platform's entry in platform_configs
+            jar: Cookie jar to use, if any
+            cookies_path: Version of the jar checked out with CookiePool.checkout (defaults to the current one)
+        """
+        args = [
+            '--no-warnings',
+            '--no-playlist',
+            '--no-check-certificate',
+            '--skip-download',
+        ]
+        
+        if platform == 'youtube':
+            args.extend(['--no-abort-on-error', '--ignore-errors'])
+        
+        # Only add cookies if the pool has a usable jar
+        if jar is not None:
+            args.extend(['--cookies', cookies_path or jar.active_path])
+            logger.info(f"Using cookies file: {jar.path}")
+        else:
+            logger.warning(f"No usable cookie jar for {platform}, proceeding without cookies")
+        
+        args.extend(['--user-agent', config['user_agent']])
+        
+        if platform in ('instagram', 'facebook'):
+            args.extend(['--referer', f'https://www.{platform}.com/'])  # Platform-specific
+        
+        return args + config['extra_args']
+    
+    def get_ydl_options(self, platform: str, jar: Optional[CookieJar] = None) -> Dict[str, Any]:
+        """
+        Get the YoutubeDL option dict for a platform's primary configuration
+        
+        Args:
+            platform: Platform name from platform_configs
+            jar: Cookie jar to include; not taken from the pool here, so
+                 building options never advances the cookie rotation
             
-            # ✅ Facebook detection
-            facebook_domains = [
-                'facebook.com', 'www.facebook.com', 'm.facebook.com',
-                'fb.com', 'www.fb.com', 'fb.watch'
-            ]
+        Returns:
+            Option dict as used by the in-process engine
+        """
+        config = self.platform_configs.get(platform)
+        if not config:
+            raise ValueError(f"No configuration found for platform: {platform}")
+        return build_ydl_options(self._primary_args(platform, config, jar) + self._cache_args())
+    
+    def _cache_args(self) -> List[str]:
+        """Arguments sharing yt-dlp's player/signature cache between all workers"""
+        return self.player_cache.args() if self.player_cache else []
+    
+    def prunable_sections(self, fields: Iterable[str]) -> FrozenSet[str]:
+        """
+        Work out which parts of the extraction the caller does not need
+        
+        Args:
+            fields: Top-level metadata keys the caller will use
             
-            if any(d in domain for d in youtube_domains):
-                return 'youtube'
-            elif any(d in domain for d in instagram_domains):
-                return 'instagram'
-            elif any(d in domain for d in facebook_domains):
-                return 'facebook'
-            else:
-                return 'unknown'
-                
-        except Exception as e:
-            logger.error(f"Error detecting platform: {e}")
-            return 'unknown'
+        Returns:
+            Section names (keys of PRUNABLE_SECTIONS) that can be skipped
+        """
+        fields = set(fields)
+        return frozenset(
+            section for section, section_fields in PRUNABLE_SECTIONS.items()
+            if not fields & section_fields
+        )
     
-    def extract_metadata_raw(self, url: str) -> Tuple[bool, Optional[Dict[Any, Any]], Optional[str]]:
+    def _pruning_args(self, platform: str, skip: FrozenSet[str]) -> List[str]:
+        """yt-dlp arguments that skip the unneeded sections, where the extractor supports it"""
+        if platform != 'youtube' or not skip:
+            return []
+        
+        skip_values = []
+        if 'captions' in skip:
+            skip_values.append('translated_subs')  # ~150 machine-translated caption languages
+        if 'formats' in skip:
+            skip_values.extend(['hls', 'dash'])  # adaptive manifests
+        extractor_args = f"youtube:skip={','.join(skip_values)}"
+        
+        if skip >= set(PRUNABLE_SECTIONS):
+            # Basic info only: the player JS is needed just to decipher format URLs
+            extractor_args += ';player_skip=js'
+        args = ['--extractor-args', extractor_args]
+        if 'formats' in skip:
+            args.append('--ignore-no-formats-error')
+        return args
+    
+    def extract_metadata_raw(self, url: str, skip: Optional[Iterable[str]] = None) -> Tuple[bool, Optional[Dict[Any, Any]], Optional[str]]:
         """
         Extract metadata using platform-specific configuration
+        
+        Args:
+            url: The video URL
+            skip: Optional sections to leave out of the extraction (see prunable_sections)
         """
         if not url:
-            return False, None, "No URL provided"
+            return False, None, ExtractionError("No URL provided", ERROR_PERMANENT)
         
         # ✅ Detect platform
         platform = self.detect_platform(url)
         logger.info(f"Detected platform: {platform} for URL: {url}")
         
         if platform == 'unknown':
-            return False, None, f"Unsupported platform. URL: {url}"
+            return False, None, ExtractionError(f"Unsupported platform. URL: {url}", ERROR_PERMANENT)
         
         # ✅ Get platform-specific configuration
         config = self.platform_configs.get(platform)
         if not config:
-            return False, None, f"No configuration found for platform: {platform}"
+            return False, None, ExtractionError(f"No configuration found for platform: {platform}", ERROR_PERMANENT)
         
-        # ✅ Route to platform-specific extraction
-        if platform == 'youtube':
-            return self._extract_youtube(url, config)
-        elif platform == 'instagram':
-            return self._extract_instagram(url, config)
-        elif platform == 'facebook':
-            return self._extract_facebook(url, config)
+        skip = frozenset(skip or ())
+        
+        # ✅ Short links name their video only after a redirect. Known mappings are used right away;
+        # an unknown link is resolved once however many requests ask for it at the same time
+        if self.short_links and is_short_link(url):
+            resolved = self.short_links.lookup(url)
+            if resolved is None:
+                short_link = url
+                (success, metadata, error), shared = self.inflight.do(
+                    (platform, f"short:{self._cache_id(platform, short_link, skip)}"),
+                    lambda: self._extract_short_link(platform, config, short_link, skip)
+                )
+                if shared and success:
+                    metadata = copy.deepcopy(metadata)
+                return success, metadata, error
+            url = resolved
+        
+        return self._extract_video(platform, config, url, skip)
+    
+    def _extract_short_link(self, platform: str, config: Dict, short_link: str,
+                            skip: FrozenSet[str]) -> Tuple[bool, Optional[Dict], Optional[str]]:
+        """
+        Resolve a short link and extract the video it points to
+        
+        The redirects are followed through the platform's proxy (a few HEAD
+        requests, not paced by the rate scheduler). Links that do not resolve
+        are handed to yt-dlp as they are.
+        """
+        resolved = None
+        proxy = self.proxy_pool.acquire(platform)
+        try:
+            resolved = self.short_links.resolve(short_link, proxy.url if proxy else None)
+        finally:
+            if proxy is not None:
+                self.proxy_pool.release(proxy, None)  # Says little about the proxy either way
+        
+        return self._extract_video(platform, config, resolved or short_link, skip, short_link)
+    
+    def _extract_video(self, platform: str, config: Dict, url: str, skip: FrozenSet[str],
+                       short_link: Optional[str] = None) -> Tuple[bool, Optional[Dict], Optional[str]]:
+        """
+        Serve a video from cache, or extract it once for all concurrent callers
+        
+        Args:
+            platform: Platform name
+            config: The platform's entry in platform_configs
+            url: Video URL (an unresolved short link is passed as-is)
+            skip: Sections to leave out of the extraction
+            short_link: The short link the request came in with, if any
+        """
+        # ✅ Serve repeat requests for the same video from cache
+        cached = self._cache_lookup(platform, url, skip)
+        if cached is not None:
+            return True, cached, None
+        
+        # ✅ Videos that recently failed are not extracted again until their backoff ends
+        failure = self.cache.get_failure(platform, self.canonical_id(url, platform)) if self.cache else None
+        if failure is not None and failure.get('retry_at', 0) > time.time():
+            logger.info(f"⛔ Negative cache hit for {platform}:{self.canonical_id(url, platform)}")
+            retry_after = None if failure['error_type'] == ERROR_PERMANENT else max(int(failure['retry_at'] - time.time()), 1)
+            return False, None, ExtractionError(failure['error'], failure['error_type'], retry_after)
+        
+        cache_id = self._cache_id(platform, url, skip)
+        prune_args = self._pruning_args(platform, skip)
+        
+        # ✅ Concurrent requests for the same video share one extraction of its normalized URL
+        # (tracking parameters and alternate URL shapes do not change the metadata)
+        normalized_url = match_url(url).normalized_url
+        (success, metadata, error), shared = self.inflight.do(
+            (platform, cache_id),
+            lambda: self._extract_and_cache(platform, cache_id, normalized_url, config, prune_args, failure)
+        )
+        
+        if success and short_link and url == short_link:
+            # Unresolved short link: learn the mapping from the URL yt-dlp ended up at
+            resolved = self.short_links.remember(short_link, metadata.get('webpage_url'))
+            if resolved and self.cache:
+                self.cache.set(platform, self._cache_id(platform, resolved, skip), metadata)
+        
+        if shared and success:
+            # Callers mutate the result, so every coalesced caller gets its own copy
+            metadata = copy.deepcopy(metadata)
+        
+        return success, metadata, error
+    
+    def canonical_id(self, url: str, platform: str) -> str:
+        """Canonical video ID for a URL, or the URL itself when no ID can be derived"""
+        match = match_url(url)
+        return (match.canonical_id if match.platform == platform else None) or url
+    
+    def _cache_id(self, platform: str, url: str, skip: FrozenSet[str]) -> str:
+        """Cache key for an extraction; pruned extractions are cached separately from full ones"""
+        video_id = self.canonical_id(url, platform)
+        return f"{video_id}#{'+'.join(sorted(skip))}" if skip else video_id
+    
+    def _cache_lookup(self, platform: str, url: str, skip: FrozenSet[str]) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached result
+        
+        Any variant that skipped a subset of the requested sections has
+        everything the caller needs (e.g. a default `#captions` entry serves
+        a basic `#captions+formats` request). The exact variant is tried first,
+        then ever richer ones up to the full entry; callers project the
+        result down to the fields they asked for.
+        """
+        if not self.cache:
+            return None
+        
+        sections = sorted(skip)
+        candidates = [
+            self._cache_id(platform, url, frozenset(subset))
+            for size in range(len(sections), -1, -1)
+            for subset in itertools.combinations(sections, size)
+        ]
+        candidate, cached = self.cache.get_first(platform, candidates)
+        if cached is not None:
+            logger.info(f"⚡ Cache hit for {platform}:{candidate}")
+        return cached
+    
+    def lookup_cached(self, url: str, skip: Optional[Iterable[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Return a cached extraction result without extracting
+        
+        Args:
+            url: The video URL
+            skip: Sections the caller does not need (see prunable_sections)
+            
+        Returns:
+            Cached metadata, or None on a miss or unsupported URL
+        """
+        platform = self.detect_platform(url)
+        if platform not in self.platform_configs:
+            return None
+        if self.short_links and is_short_link(url):
+            url = self.short_links.lookup(url) or url
+        return self._cache_lookup(platform, url, frozenset(skip or ()))
+    
+    def _extract_and_cache(self, platform: str, cache_id: str, url: str, config: Dict, prune_args: List[str],
+                           previous_failure: Optional[Dict[str, Any]] = None) -> Tuple[bool, Optional[Dict], Optional[str]]:
+        """Run the extraction behind the platform's circuit breaker and cache the outcome"""
+        breaker = self.breakers[platform]
+        allowed, retry_after = breaker.allow()
+        if not allowed:
+            logger.warning(f"🔴 {platform} circuit open, failing fast")
+            return False, None, ExtractionError(
+                f"{platform.capitalize()} extraction temporarily suspended after repeated failures",
+                ERROR_RETRYABLE, retry_after
+            )
+        
+        success, metadata, error = self._extract_platform(platform, url, config, prune_args)
+        error_type = None if success else classify_error(error)
+        
+        # Refused by our own rate scheduler: the platform was never asked, so nothing to record
+        if error_type == ERROR_THROTTLED:
+            breaker.release()
+            return success, metadata, error
+        
+        # A permanent error is still a definite answer from the platform
+        if success or error_type == ERROR_PERMANENT:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+        
+        if not self.cache:
+            return success, metadata, error
+        
+        video_id = self.canonical_id(url, platform)
+        if success:
+            self.cache.set(platform, cache_id, metadata)
+            if previous_failure is not None:
+                self.cache.clear_failure(platform, video_id)
         else:
-            return False, None, f"Platform {platform} not implemented yet"
+            self._record_failure(platform, video_id, error, error_type, previous_failure)
+        
+        return success, metadata, error
     
-    def _extract_youtube(self, url: str, config: Dict) -> Tuple[bool, Optional[Dict], Optional[str]]:
-        """Extract from YouTube with YouTube-specific settings"""
-        logger.info("🎥 Extracting from YouTube")
+    def _record_failure(self, platform: str, video_id: str, error: str, error_type: str,
+                        previous_failure: Optional[Dict[str, Any]]):
+        """
+        Negative-cache a failed video
         
-        # Check if cookies file exists
-        import os
-        cookies_exist = os.path.exists(config['cookies'])
+        Permanent failures are kept for NEGATIVE_CACHE_TTL. Other failures back
+        off exponentially per video (NEGATIVE_BACKOFF_BASE doubling up to
+        NEGATIVE_BACKOFF_MAX); the failure count outlives the backoff window
+        so repeated failures keep growing it.
+        """
+        failures = (previous_failure or {}).get('failures', 0) + 1
         
-        for attempt in range(self.max_retries):
-            try:
-                cmd = [
-                    sys.executable, '-m', 'yt_dlp',
-                    '--dump-json',
-                    '--no-warnings',
-                    '--no-playlist',
-                    '--no-check-certificate',
-                    '--skip-download',
-                    '--no-abort-on-error',
-                    '--ignore-errors',
-                    '--user-agent', config['user_agent'],
-                    '--sleep-interval', config['sleep_interval'],
-                ]
-                
-                # Only add cookies if file exists
-                if cookies_exist:
-                    cmd.extend(['--cookies', config['cookies']])
-                    logger.info(f"Using cookies file: {config['cookies']}")
-                else:
-                    logger.warning(f"Cookie file not found: {config['cookies']}, proceeding without cookies")
-                
-                # Add extra args and URL
-                cmd.extend(config['extra_args'] + [url])
-                
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=self.timeout)
-                
-                if result.returncode == 0:
-                    metadata = json.loads(result.stdout)
-                    logger.info(f"✅ YouTube extraction successful: {metadata.get('title', 'Unknown')}")
-                    return True, metadata, None
-                else:
-                    error_msg = result.stderr.strip()
-                    logger.warning(f"❌ YouTube attempt {attempt + 1} failed: {error_msg}")
-                    
-                    # Try fallback on last attempt
-                    if attempt == self.max_retries - 1:
-                        logger.info("🔄 Trying YouTube fallback methods")
-                        return self._youtube_fallback_method(url)
-                    
-            except Exception as e:
-                logger.error(f"Exception in YouTube extraction: {e}")
-                if attempt == self.max_retries - 1:
-                    return self._youtube_fallback_method(url)
+        if error_type == ERROR_PERMANENT:
+            backoff = settings.NEGATIVE_CACHE_TTL
+            ttl = backoff
+        else:
+            backoff = min(settings.NEGATIVE_BACKOFF_BASE * 2 ** (failures - 1), settings.NEGATIVE_BACKOFF_MAX)
+            ttl = settings.NEGATIVE_BACKOFF_MAX * 2
         
-        return False, None, "YouTube extraction failed after all retries"
+        if backoff <= 0:
+            return
+        
+        self.cache.set_failure(platform, video_id, {
+            'error': error,
+            'error_type': error_type,
+            'failures': failures,
+            'retry_at': time.time() + backoff,
+        }, ttl)
+        logger.info(f"⛔ {platform}:{video_id} backing off {backoff}s after {failures} failure(s)")
     
-    def _extract_instagram(self, url: str, config: Dict) -> Tuple[bool, Optional[Dict], Optional[str]]:
-        """Extract from Instagram with Instagram-specific settings"""
-        logger.info("📷 Extracting from Instagram")
+    def _strategies(self, platform: str, config: Dict, prune_args: List[str] = ()) -> List[Dict[str, Any]]:
+        """
+        Extraction strategies for a platform, primary (cookie based) configuration first
         
-        for attempt in range(self.max_retries):
-            try:
-                # ✅ Instagram-specific command
-                cmd = [
-                    sys.executable, '-m', 'yt_dlp',
-                    '--dump-json',
+        Each strategy has a name, its yt-dlp arguments and the fields tagged onto
+        a successful result. The primary's cookie jar version is checked out and
+        must be released once the strategies are done with (see _extract_platform).
+        """
+        prune_args = list(prune_args)
+        jar = self.cookie_pool.acquire(platform)
+        cookies_path = self.cookie_pool.checkout(jar) if jar is not None else None
+        strategies = [{
+            'name': 'primary',
+            'args': self._primary_args(platform, config, jar, cookies_path) + prune_args,
+            'tags': {} if platform == 'youtube' else {'platform': platform, 'extracted_from': f'{platform}_service'},
+            'cookie_jar': jar,
+            'cookies_path': cookies_path,
+        }]
+        
+        if platform == 'youtube':
+            # Without cookies, with different clients
+            fallbacks = [
+                # Strategy 1: Basic extraction with mobile user agent
+                ('mobile_ua', 'Mozilla/5.0 (iPhone; CPU iPhone OS 16_0 like Mac OS X) AppleWebKit/605.1.15',
+                 ['--extractor-retries', '5']),
+                # Strategy 2: Desktop browser simulation
+                ('linux_ua', 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+                 ['--geo-bypass', '--extractor-retries', '3']),
+                # Strategy 3: Minimal extraction (last resort)
+                ('minimal_ua', 'yt-dlp/2025.08.11',
+                 ['--no-check-certificate', '--geo-bypass-country', 'US']),
+            ]
+            for i, (name, user_agent, extra_args) in enumerate(fallbacks):
+                strategies.append({
+                    'name': name,
+                    'args': [
+                        '--no-warnings',
+                        '--no-playlist',
+                        '--skip-download',
+                        '--no-abort-on-error',
+                        '--ignore-errors',
+                        '--user-agent', user_agent,
+                    ] + extra_args + prune_args,
+                    'tags': {'platform': 'youtube', 'extraction_method': f'fallback_strategy_{i+1}'},
+                })
+        
+        elif platform in ('instagram', 'facebook'):
+            # ✅ Try without cookies but with mobile app user agent
+            strategies.append({
+                'name': 'app_ua',
+                'args': [
                     '--no-warnings',
-                    '--no-playlist',
-                    '--no-check-certificate',
-                    '--skip-download',
-                    '--cookies', config['cookies'],
-                    '--user-agent', config['user_agent'],
-                    '--sleep-interval', config['sleep_interval'],
-                    '--referer', 'https://www.instagram.com/',  # Instagram-specific
-                ] + config['extra_args'] + [url]
-                
-                logger.info(f"Instagram extraction attempt {attempt + 1}")
-                
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=self.timeout)
-                
-                if result.returncode == 0:
-                    try:
-                        metadata = json.loads(result.stdout)
-                        logger.info(f"✅ Instagram extraction successful: {metadata.get('title', 'Unknown')}")
-                        
-                        # ✅ Add Instagram-specific metadata
-                        metadata['platform'] = 'instagram'
-                        metadata['extracted_from'] = 'instagram_service'
-                        
-                        return True, metadata, None
-                    except json.JSONDecodeError as e:
-                        logger.error(f"JSON decode error: {e}")
-                        continue
-                else:
-                    error_msg = result.stderr.strip()
-                    logger.warning(f"❌ Instagram attempt {attempt + 1} failed: {error_msg}")
-                    
-                    # ✅ Try fallback method for Instagram
-                    if attempt == self.max_retries - 1:
-                        return self._instagram_fallback_method(url)
-                    
-            except Exception as e:
-                logger.error(f"Exception in Instagram extraction: {e}")
+                    '--user-agent', f"{platform.capitalize()} 219.0.0.12.117 Android",
+                    '--referer', f'https://www.{platform}.com/',
+                ] + prune_args,
+                'tags': {'platform': platform, 'extraction_method': 'fallback'},
+            })
         
-        return False, None, "Instagram extraction failed after all retries"
+        return strategies
     
-    def _instagram_fallback_method(self, url: str) -> Tuple[bool, Optional[Dict], Optional[str]]:
-        """Fallback method for Instagram when cookies fail"""
-        logger.info("🔄 Trying Instagram fallback method")
+    def _extract_platform(self, platform: str, url: str, config: Dict, prune_args: List[str] = ()) -> Tuple[bool, Optional[Dict], Optional[str]]:
+        """Run the platform's strategies, hedged or one after another"""
+        emoji = {'youtube': '🎥', 'instagram': '📷', 'facebook': '📘'}.get(platform, '🔎')
+        logger.info(f"{emoji} Extracting from {platform.capitalize()}")
         
+        strategies = self._strategies(platform, config, prune_args)
+        cookies_path = strategies[0].get('cookies_path')
         try:
-            # ✅ Try without cookies but with mobile user agent
-            cmd = [
-                sys.executable, '-m', 'yt_dlp',
-                '--dump-json',
-                '--no-warnings',
-                '--user-agent', 'Instagram 219.0.0.12.117 Android',
-                '--sleep-interval', '4',
-                '--referer', 'https://www.instagram.com/',
-                url
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=self.timeout)
+            if settings.STRATEGY_ADAPTIVE:
+                strategies = self.strategy_stats.order(platform, strategies)
+                logger.info(f"Strategy order for {platform}: {', '.join(s['name'] for s in strategies)}")
             
-            if result.returncode == 0:
-                metadata = json.loads(result.stdout)
-                logger.info("✅ Instagram fallback method successful")
-                metadata['platform'] = 'instagram'
-                metadata['extraction_method'] = 'fallback'
-                return True, metadata, None
+            if settings.HEDGE_ENABLED:
+                result = self._run_hedged(platform, url, strategies)
             else:
-                return False, None, f"Instagram fallback failed: {result.stderr.strip()}"
-                
-        except Exception as e:
-            return False, None, f"Instagram fallback error: {e}"
-    
-    def _extract_facebook(self, url: str, config: Dict) -> Tuple[bool, Optional[Dict], Optional[str]]:
-        """Extract from Facebook with Facebook-specific settings"""
-        logger.info("📘 Extracting from Facebook")
+                result = self._run_sequential(platform, url, strategies)
+        finally:
+            # Cancelled hedges still winding down hold their own pin (see _attempt)
+            if cookies_path:
+                self.cookie_pool.release(cookies_path)
         
-        for attempt in range(self.max_retries):
-            try:
-                cmd = [
-                    sys.executable, '-m', 'yt_dlp',
-                    '--dump-json',
-                    '--no-warnings',
-                    '--no-playlist',
-                    '--no-check-certificate',
-                    '--skip-download',
-                    '--cookies', config['cookies'],
-                    '--user-agent', config['user_agent'],
-                    '--sleep-interval', config['sleep_interval'],
-                    '--referer', 'https://www.facebook.com/',  # Facebook-specific
-                ] + config['extra_args'] + [url]
-
-                logger.info(f"Facebook extraction attempt {attempt + 1}")
-                
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=self.timeout)
-
-                if result.returncode == 0:
-                    try:
-                        metadata = json.loads(result.stdout)
-                        logger.info(f"✅ Facebook extraction successful: {metadata.get('title', 'Unknown')}")
-                        
-                        # ✅ Add Instagram-specific metadata
-                        metadata['platform'] = 'facebook'
-                        metadata['extracted_from'] = 'facebook_service'
-                        
-                        return True, metadata, None
-                    except json.JSONDecodeError as e:
-                        logger.error(f"JSON decode error: {e}")
-                        continue
-                else:
-                    error_msg = result.stderr.strip()
-                    logger.warning(f"❌ Facebook attempt {attempt + 1} failed: {error_msg}")
-
-            # ✅ Try fallback method for Instagram
-                    if attempt == self.max_retries - 1:
-                        return self._facebook_fallback_method(url)
-                    
-            except Exception as e:
-                logger.error(f"Exception in Facebook extraction: {e}")
+        success, metadata, error = result
+        if success:
+            logger.info(f"✅ {platform.capitalize()} extraction successful: {metadata.get('title', 'Unknown')}")
+            return result
         
-        return False, None, "Facebook extraction failed after all retries"
-
-    def _facebook_fallback_method(self, url: str) -> Tuple[bool, Optional[Dict], Optional[str]]:
-        """Fallback method for Facebook when cookies fail"""
-        logger.info("🔄 Trying Facebook fallback method")
+        if error.error_type in (ERROR_PERMANENT, ERROR_THROTTLED):
+            return False, None, error  # The video itself is the problem, or nothing was attempted: say so as-is
+        if platform == 'youtube':
+            message = f"All YouTube fallback strategies failed. Server may need browser cookies or different IP. Last error: {error}"
+        else:
+            message = f"{platform.capitalize()} extraction failed: {error}"
+        return False, None, ExtractionError(message, error.error_type)
+    
+    def _attempt(self, platform: str, url: str, strategy: Dict[str, Any],
+                 cancel: Optional[threading.Event] = None, pace: bool = True) -> Tuple[bool, Optional[Dict], Optional[str]]:
+        """
+        Run one strategy once, through a proxy if the platform has any; exceptions become classified failures
+        
+        Only the first attempt of an extraction is paced (pace=True): retries and
+        fallbacks belong to the request that already paid for its token.
+        """
+        jar = strategy.get('cookie_jar')
+        cookies_path = strategy.get('cookies_path')
+        if cookies_path:
+            self.cookie_pool.retain(cookies_path)
+        proxy = self.proxy_pool.acquire(platform, jar.path if jar else None)
+        proxy_outcome = None
         
         try:
-            # ✅ Try without cookies but with mobile user agent
-            cmd = [
-                sys.executable, '-m', 'yt_dlp',
-                '--dump-json',
-                '--no-warnings',
-                '--user-agent', 'Facebook 219.0.0.12.117 Android',
-                '--sleep-interval', '4',
-                '--referer', 'https://www.facebook.com/',
-                url
-            ]
+            bucket = self.proxy_pool.bucket_key(platform, proxy) if proxy else platform
+            args = strategy['args'] + self._cache_args() + (['--proxy', proxy.url] if proxy else [])
+            
+            # A hedge that already lost must not reserve a token (and push back everyone after it)
+            if cancel is not None and cancel.is_set():
+                return False, None, ExtractionError(CANCELLED_ERROR, ERROR_RETRYABLE)
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=self.timeout)
+            try:
+                if pace and not self.scheduler.acquire(bucket, cancel):
+                    retry_after = max(int(self.scheduler.estimate_wait(bucket)), 1)
+                    return False, None, ExtractionError(f"Too many pending {platform} extractions, try again later",
+                                                        ERROR_THROTTLED, retry_after)
+            except Exception as e:
+                logger.error(f"Rate scheduler error for {bucket}: {e}")  # never block extraction on it
             
-            if result.returncode == 0:
-                metadata = json.loads(result.stdout)
-                logger.info("✅ Facebook fallback method successful")
-                metadata['platform'] = 'facebook'
-                metadata['extraction_method'] = 'fallback'
+            if cancel is not None and cancel.is_set():
+                return False, None, ExtractionError(CANCELLED_ERROR, ERROR_RETRYABLE)
+            
+            started = time.monotonic()
+            try:
+                success, metadata, error = self._run_engine(url, args, cancel)
+            except Exception as e:
+                logger.error(f"Exception in {platform} strategy {strategy['name']}: {e}")
+                success, metadata = False, None
+                error = ExtractionError(str(e), classify_error(str(e), e))
+            elapsed = time.monotonic() - started
+            
+            if not success and not isinstance(error, ExtractionError):
+                error = ExtractionError(error or 'yt-dlp returned no data', classify_error(error))
+            
+            # Score the strategy, cookie jar and proxy, unless the failure says nothing about them:
+            # a gone video fails every strategy alike, and cancelled hedges merely lost the race
+            if success or (error.error_type != ERROR_PERMANENT and error != CANCELLED_ERROR):
+                self.strategy_stats.record(platform, strategy['name'], success, elapsed)
+                proxy_outcome = success
+                if jar is not None:
+                    self.cookie_pool.record(jar, success, auth_failure=not success and error.error_type == ERROR_AUTH)
+            
+            if success:
+                metadata.update(strategy['tags'])
                 return True, metadata, None
-            else:
-                return False, None, f"Facebook fallback failed: {result.stderr.strip()}"
-                
-        except Exception as e:
-            return False, None, f"Facebook fallback error: {e}"    
+            return False, None, error
+        
+        finally:
+            if proxy is not None:
+                self.proxy_pool.release(proxy, proxy_outcome)
+            if cookies_path:
+                self.cookie_pool.release(cookies_path)
     
-    def _youtube_fallback_method(self, url: str) -> Tuple[bool, Optional[Dict], Optional[str]]:
-        """Fallback method for YouTube when cookies or format issues occur"""
-        logger.info("🔄 Trying YouTube fallback method")
-        
-        # Try multiple fallback strategies
-        fallback_strategies = [
-            # Strategy 1: Basic extraction with mobile user agent
-            {
-                'user_agent': 'Mozilla/5.0 (iPhone; CPU iPhone OS 16_0 like Mac OS X) AppleWebKit/605.1.15',
-                'extra_args': ['--extractor-retries', '5']
-            },
-            # Strategy 2: Desktop browser simulation
-            {
-                'user_agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'extra_args': ['--geo-bypass', '--extractor-retries', '3']
-            },
-            # Strategy 3: Minimal extraction (last resort)
-            {
-                'user_agent': 'yt-dlp/2025.08.11',
-                'extra_args': ['--no-check-certificate', '--geo-bypass-country', 'US']
-            }
-        ]
+    def _run_engine(self, url: str, args: List[str], cancel: Optional[threading.Event] = None) -> Tuple[bool, Optional[Dict], Optional[str]]:
+        """
+        Run yt-dlp in one of the EXTRACTION_CONCURRENCY slots
         
-        for i, strategy in enumerate(fallback_strategies):
-            try:
-                logger.info(f"🔄 Trying fallback strategy {i+1}/3")
-                
-                cmd = [
-                    sys.executable, '-m', 'yt_dlp',
-                    '--dump-json',
-                    '--no-warnings',
-                    '--no-playlist',
-                    '--skip-download',
-                    '--no-abort-on-error',
-                    '--ignore-errors',
-                    '--user-agent', strategy['user_agent'],
-                    '--sleep-interval', '3',
-                ] + strategy['extra_args'] + [url]
+        Taken only after the rate scheduler's wait is over, so paced
+        extractions never sit on a slot while they sleep.
+        """
+        if self._extraction_slots is None:
+            return self.engine.extract(url, args, self.timeout, cancel)
+        
+        with self._extraction_slots:
+            if cancel is not None and cancel.is_set():
+                return False, None, CANCELLED_ERROR
+            return self.engine.extract(url, args, self.timeout, cancel)
+    
+    def _run_sequential(self, platform: str, url: str, strategies: List[Dict[str, Any]]) -> Tuple[bool, Optional[Dict], Optional[str]]:
+        """
+        Retry the primary strategy, then try each fallback in turn
+        
+        Only retryable errors are retried with the same strategy; auth errors
+        move on to the next one, permanent and throttled errors stop immediately.
+        """
+        error = auth_error = None
+        paced = False
+        
+        for strategy in strategies:
+            attempts = self.max_retries if strategy['name'] == 'primary' else 1
+            for attempt in range(attempts):
+                logger.info(f"🔄 {platform} strategy {strategy['name']} attempt {attempt + 1}/{attempts}")
+                success, metadata, error = self._attempt(platform, url, strategy, pace=not paced)
+                paced = True
+                if success:
+                    return True, metadata, None
+                logger.warning(f"❌ {platform} strategy {strategy['name']} failed ({error.error_type}): {error}")
                 
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=self.timeout)
+                if error.error_type in (ERROR_PERMANENT, ERROR_THROTTLED):
+                    return False, None, error
+                if error.error_type == ERROR_AUTH:
+                    auth_error = error
+                    break
+        
+        # A bot check explains the failure better than whatever the last fallback hit
+        return False, None, auth_error or error
+    
+    def _run_hedged(self, platform: str, url: str, strategies: List[Dict[str, Any]]) -> Tuple[bool, Optional[Dict], Optional[str]]:
+        """
+        Run strategies in parallel with a staggered start
+        
+        The next strategy starts once HEDGE_DELAY seconds pass without a result
+        or as soon as a running strategy fails, with at most HEDGE_MAX_FANOUT
+        running at once. The first success wins and the rest are cancelled.
+        As in sequential mode, a retryable failure of the primary strategy is
+        retried (up to max_retries attempts), next in line. A throttled
+        strategy launches no further ones, but those already running are
+        left to finish.
+        """
+        remaining = list(strategies)
+        pending: Dict[Future, Tuple[Dict[str, Any], threading.Event]] = {}
+        attempts: Dict[str, int] = {}
+        error = auth_error = throttled_error = None
+        
+        def launch():
+            strategy = remaining.pop(0)
+            first = not attempts  # Only the first attempt takes a rate token
+            attempts[strategy['name']] = attempts.get(strategy['name'], 0) + 1
+            cancel = threading.Event()
+            future = self._hedge_executor.submit(self._attempt, platform, url, strategy, cancel, first)
+            pending[future] = (strategy, cancel)
+            with self._hedge_lock:
+                self._hedge_stats['launched'] += 1
+                if len(pending) > 1:
+                    self._hedge_stats['hedged'] += 1
+            if len(pending) > 1:
+                logger.info(f"🔀 Hedging {platform} extraction with strategy {strategy['name']}")
+        
+        launch()
+        try:
+            while pending:
+                hedge_delay = settings.HEDGE_DELAY if remaining and len(pending) < settings.HEDGE_MAX_FANOUT else None
+                done, _ = wait(pending, timeout=hedge_delay, return_when=FIRST_COMPLETED)
                 
-                if result.returncode == 0:
-                    metadata = json.loads(result.stdout)
-                    logger.info(f"✅ YouTube fallback strategy {i+1} successful")
-                    metadata['platform'] = 'youtube'
-                    metadata['extraction_method'] = f'fallback_strategy_{i+1}'
-                    return True, metadata, None
-                else:
-                    logger.warning(f"❌ Fallback strategy {i+1} failed: {result.stderr.strip()}")
+                for future in done:
+                    strategy, _ = pending.pop(future)
+                    success, metadata, error = future.result()
+                    if success:
+                        with self._hedge_lock:
+                            wins = self._hedge_stats['wins']
+                            wins[strategy['name']] = wins.get(strategy['name'], 0) + 1
+                        return True, metadata, None
+                    logger.warning(f"❌ {platform} strategy {strategy['name']} failed ({error.error_type}): {error}")
                     
-            except Exception as e:
-                logger.error(f"Exception in fallback strategy {i+1}: {e}")
+                    if error.error_type == ERROR_PERMANENT:
+                        return False, None, error  # Remaining strategies are cancelled below
+                    if error.error_type == ERROR_THROTTLED:
+                        throttled_error = error
+                        remaining.clear()
+                    if error.error_type == ERROR_AUTH:
+                        auth_error = error
+                    if (error.error_type == ERROR_RETRYABLE and strategy['name'] == 'primary'
+                            and attempts[strategy['name']] < self.max_retries):
+                        remaining.insert(0, strategy)
                 
-        return False, None, "All YouTube fallback strategies failed. Server may need browser cookies or different IP."
-            
+                # Hedge delay elapsed or a strategy failed: bring in the next one
+                if remaining and len(pending) < settings.HEDGE_MAX_FANOUT:
+                    launch()
+        finally:
+            for future, (strategy, cancel) in pending.items():
+                cancel.set()
+                future.cancel()
+                with self._hedge_lock:
+                    self._hedge_stats['cancelled'] += 1
+        
+        # Not every strategy got its turn, so the failure must not count against the video
+        return False, None, throttled_error or auth_error or error
+    
+
     def get_platform_info(self, url: str) -> Dict[str, Any]:
         """Get information about the detected platform"""
         platform = self.detect_platform(url)
@@ -421,8 +804,48 @@ class MultiPlatformYtDlpService:
             'supported': platform in self.platform_configs,
             'cookies_file': config.get('cookies', 'Not configured'),
             'user_agent': config.get('user_agent', 'Default'),
-            'configuration': config
+            'configuration': {**config, 'proxies': [mask_proxy(url) for url in config['proxies']]} if config else config,
+            'circuit_breaker': self.breakers[platform].get_state() if platform in self.breakers else None
+        }
+    
+    def get_breaker_states(self) -> Dict[str, Dict[str, Any]]:
+        """Circuit breaker state of every platform"""
+        return {platform: breaker.get_state() for platform, breaker in self.breakers.items()}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Runtime counters for monitoring"""
+        stats = {
+            'engine': self.engine.name,
+            'cache': self.cache.get_stats() if self.cache else {'enabled': False},
+            'coalescing': self.inflight.get_stats(),
+            'cookies': self.cookie_pool.get_stats(),
+            'proxies': self.proxy_pool.get_stats(),
+            'scheduler': self.scheduler.get_stats(),
+            'player_cache': self.player_cache.get_stats() if self.player_cache else {'enabled': False},
+            'short_links': self.short_links.get_stats() if self.short_links else {'enabled': False},
         }
+        if settings.STRATEGY_ADAPTIVE:
+            stats['strategies'] = self.strategy_stats.get_stats()
+        if settings.HEDGE_ENABLED:
+            with self._hedge_lock:
+                stats['hedging'] = copy.deepcopy(self._hedge_stats)
+        if hasattr(self.engine, 'get_stats'):
+            stats['worker_pool'] = self.engine.get_stats()
+        return stats
+
+_service = None
+_service_lock = threading.Lock()
+
+def get_multi_platform_service() -> MultiPlatformYtDlpService:
+    """Shared service, created on first use (in the worker, not the gunicorn master)"""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = MultiPlatformYtDlpService()
+        return _service
 
-# Create service instance
-multi_platform_service = MultiPlatformYtDlpService()
+def __getattr__(name: str):
+    # `from ... import multi_platform_service` keeps working, creating the service lazily
+    if name == 'multi_platform_service':
+        return get_multi_platform_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
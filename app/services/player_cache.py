@@ -0,0 +1,138 @@
+"""
+Player Cache
+Shared on-disk yt-dlp cache (YouTube player JS, signature and n-parameter functions) with hit counters
+"""
+import logging
+import os
+import shutil
+import threading
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_MISS = object()
+
+# Loads counted in this process, per cache section (e.g. youtube-sigfuncs, youtube-nsig)
+_lock = threading.Lock()
+_sections: Dict[str, Dict[str, int]] = {}
+
+
+def instrument(ydl):
+    """
+    Count the cache hits and misses of a YoutubeDL instance
+
+    yt-dlp consults its cache when it meets a player version for the first
+    time; a miss means downloading and parsing the player JS to rebuild the
+    decipher functions in the request path.
+
+    Args:
+        ydl: yt_dlp.YoutubeDL instance (wrapped once; later calls do nothing)
+    """
+    cache = ydl.cache
+    if getattr(cache, '_counted', False):
+        return
+
+    load = cache.load
+
+    def counted_load(section, key, dtype='json', default=None, **kwargs):
+        value = load(section, key, dtype, _MISS, **kwargs)
+        with _lock:
+            counts = _sections.setdefault(section, {'hits': 0, 'misses': 0})
+            counts['misses' if value is _MISS else 'hits'] += 1
+        return default if value is _MISS else value
+
+    cache.load = counted_load
+    cache._counted = True
+
+
+class PlayerCache:
+    """
+    yt-dlp cache directory shared by every worker and engine on the host
+
+    All extractions run with the same `--cache-dir`, so a player version
+    deciphered by one worker (or one short-lived subprocess) is reused by
+    all others instead of being fetched and parsed again. A seed directory
+    (e.g. baked into the image, or copied from a warm host) pre-populates
+    it at startup without overwriting newer entries.
+    """
+
+    def __init__(self, path: str, seed_dir: Optional[str] = None):
+        self.path = os.path.abspath(path)
+        self.seed_dir = seed_dir
+        os.makedirs(self.path, exist_ok=True)
+        if seed_dir:
+            self.seed(seed_dir)
+
+    def seed(self, seed_dir: str) -> int:
+        """
+        Copy cache entries missing from the cache directory
+
+        Args:
+            seed_dir: Directory laid out like a yt-dlp cache dir
+
+        Returns:
+            Number of files copied
+        """
+        if not os.path.isdir(seed_dir):
+            logger.warning(f"yt-dlp cache seed directory {seed_dir} does not exist")
+            return 0
+
+        copied = 0
+        for root, _, files in os.walk(seed_dir):
+            target_dir = os.path.join(self.path, os.path.relpath(root, seed_dir))
+            for name in files:
+                target = os.path.join(target_dir, name)
+                if os.path.exists(target):
+                    continue
+                try:
+                    os.makedirs(target_dir, exist_ok=True)
+                    temp_path = f"{target}.{os.getpid()}.tmp"
+                    shutil.copyfile(os.path.join(root, name), temp_path)
+                    os.replace(temp_path, target)  # workers seeding at once never see half a file
+                    copied += 1
+                except OSError as e:
+                    logger.warning(f"Could not seed yt-dlp cache entry {target}: {e}")
+
+        if copied:
+            logger.info(f"🗄️ Seeded {copied} yt-dlp cache entries from {seed_dir}")
+        return copied
+
+    def args(self) -> List[str]:
+        """yt-dlp arguments pointing at the shared cache"""
+        return ['--cache-dir', self.path]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Hit rates of this process and what is on disk
+
+        Loads are only counted for in-process extractions ('inprocess' engine);
+        subprocesses and pool workers use the same directory but keep their own counts.
+        """
+        with _lock:
+            sections = {name: dict(counts) for name, counts in _sections.items()}
+
+        for counts in sections.values():
+            lookups = counts['hits'] + counts['misses']
+            counts['hit_rate'] = round(counts['hits'] / lookups, 3) if lookups else 0.0
+        hits = sum(c['hits'] for c in sections.values())
+        misses = sum(c['misses'] for c in sections.values())
+
+        files = 0
+        size = 0
+        for root, _, names in os.walk(self.path):
+            for name in names:
+                try:
+                    size += os.path.getsize(os.path.join(root, name))
+                    files += 1
+                except OSError:
+                    pass
+
+        return {
+            'path': self.path,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / (hits + misses), 3) if hits + misses else 0.0,
+            'sections': sections,
+            'files': files,
+            'bytes': size,
+        }
@@ -0,0 +1,174 @@
+"""
+Proxy Pool
+Spreads extractions over outbound proxies by token availability and recent health
+"""
+import hashlib
+import logging
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, Deque, List, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+
+def mask_proxy(url: str) -> str:
+    """Proxy URL without credentials, for logs and stats"""
+    parsed = urlparse(url)
+    if not parsed.password and not parsed.username:
+        return url
+    return parsed._replace(netloc=parsed.hostname + (f":{parsed.port}" if parsed.port else '')).geturl()
+
+
+class Proxy:
+    """One outbound proxy and its recent outcomes"""
+
+    def __init__(self, url: str, window: int = 50):
+        self.url = url
+        self.name = mask_proxy(url)
+        # Same host with different credentials is a different exit (and account); the
+        # digest tells them apart without putting the credentials in bucket names
+        self.key = f"{self.name}#{hashlib.sha1(url.encode()).hexdigest()[:8]}"
+        self.outcomes: Deque[bool] = deque(maxlen=window)
+        self.consecutive_failures = 0
+        self.quarantined_until = 0.0
+        self.in_use = 0
+
+    @property
+    def failure_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return 1 - sum(self.outcomes) / len(self.outcomes)
+
+    def to_dict(self, now: float) -> Dict[str, Any]:
+        return {
+            'proxy': self.name,
+            'attempts': len(self.outcomes),
+            'failure_rate': round(self.failure_rate, 3),
+            'in_use': self.in_use,
+            'quarantined': self.quarantined_until > now,
+            'quarantined_for': max(int(self.quarantined_until - now), 0),
+        }
+
+
+class ProxyPool:
+    """
+    Outbound proxies per platform
+
+    Every (platform, proxy) pair has its own token bucket in the rate
+    scheduler, so the request budget grows with the number of proxies
+    instead of being capped by one IP's reputation. Each extraction goes to
+    the healthy proxy whose bucket frees up first, ties broken by recent
+    failure rate; a proxy with `quarantine_after` failures in a row is rested
+    for `quarantine_seconds`. With sticky cookies, a cookie jar (account)
+    stays on one proxy while that proxy is healthy, since platforms flag
+    accounts that hop between IPs.
+    """
+
+    def __init__(self, proxies: Dict[str, List[str]], scheduler, quarantine_after: int = 3,
+                 quarantine_seconds: int = 600, sticky_cookies: bool = True):
+        self.scheduler = scheduler
+        self.quarantine_after = quarantine_after
+        self.quarantine_seconds = quarantine_seconds
+        self.sticky_cookies = sticky_cookies
+
+        self._lock = threading.Lock()
+        self._proxies: Dict[str, List[Proxy]] = {
+            platform: [Proxy(url) for url in urls]
+            for platform, urls in proxies.items() if urls
+        }
+        self._bindings: Dict[str, Proxy] = {}
+
+        # Every proxy paces each platform like the server's own IP would
+        for platform, pool in self._proxies.items():
+            for proxy in pool:
+                key = self.bucket_key(platform, proxy)
+                scheduler.rates[key] = scheduler.rates.get(platform, 0)
+                scheduler.bursts[key] = scheduler.bursts.get(platform, 1)
+            logger.info(f"🌐 {len(pool)} outbound proxies for {platform}")
+
+    @staticmethod
+    def bucket_key(platform: str, proxy: Proxy) -> str:
+        """Rate scheduler bucket for a platform behind a proxy"""
+        return f"{platform}@{proxy.key}"
+
+    def acquire(self, platform: str, binding: Optional[str] = None) -> Optional[Proxy]:
+        """
+        Pick the proxy for the next extraction
+
+        Args:
+            platform: Platform name
+            binding: Optional identity to keep on one proxy (e.g. a cookie jar path)
+
+        Returns:
+            The chosen proxy (release it when done), or None when the platform has no proxies
+        """
+        pool = self._proxies.get(platform)
+        if not pool:
+            return None
+
+        now = time.time()
+        waits = {}
+        for proxy in pool:
+            try:
+                waits[proxy.url] = self.scheduler.estimate_wait(self.bucket_key(platform, proxy))
+            except Exception:
+                waits[proxy.url] = 0.0
+
+        with self._lock:
+            bound = self._bindings.get(binding) if binding and self.sticky_cookies else None
+            if bound is not None and bound.quarantined_until <= now:
+                proxy = bound
+            else:
+                healthy = [p for p in pool if p.quarantined_until <= now]
+                if healthy:
+                    proxy = min(healthy, key=lambda p: (waits[p.url], p.failure_rate, p.in_use))
+                else:
+                    # Everything is resting: use the proxy that comes back first
+                    proxy = min(pool, key=lambda p: p.quarantined_until)
+
+                if binding and self.sticky_cookies:
+                    if bound is not None:
+                        logger.info(f"🌐 Rebinding {binding} from {bound.name} to {proxy.name}")
+                    self._bindings[binding] = proxy
+
+            proxy.in_use += 1
+            return proxy
+
+    def release(self, proxy: Proxy, success: Optional[bool]):
+        """
+        Return a proxy and record the outcome
+
+        Args:
+            proxy: Proxy from acquire
+            success: True/False for a result that reflects on the proxy, None to ignore it
+        """
+        with self._lock:
+            proxy.in_use -= 1
+            if success is None:
+                return
+
+            proxy.outcomes.append(success)
+            if success:
+                proxy.consecutive_failures = 0
+                return
+
+            proxy.consecutive_failures += 1
+            if proxy.consecutive_failures >= self.quarantine_after:
+                proxy.quarantined_until = time.time() + self.quarantine_seconds
+                proxy.consecutive_failures = 0
+                logger.warning(f"🌐 Resting proxy {proxy.name} for {self.quarantine_seconds}s after repeated failures")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Proxies and their health per platform"""
+        now = time.time()
+        with self._lock:
+            return {
+                'sticky_cookies': self.sticky_cookies,
+                'bindings': len(self._bindings),
+                'platforms': {
+                    platform: [proxy.to_dict(now) for proxy in pool]
+                    for platform, pool in self._proxies.items()
+                }
+            }
@@ -0,0 +1,195 @@
+"""
+Rate Scheduler
+Per-platform token buckets that pace outbound extractions, optionally shared across workers
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _MemoryBucketStore:
+    """Bucket state for a single process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tat: Dict[str, float] = {}
+
+    def reserve(self, key: str, interval: float, tolerance: float, max_wait: float) -> Optional[float]:
+        with self._lock:
+            now = time.time()
+            tat = max(self._tat.get(key, now), now)
+            wait = max(0.0, tat - tolerance - now)
+            if wait > max_wait:
+                return None
+            self._tat[key] = tat + interval
+            return wait
+
+    def backlog(self, key: str) -> float:
+        with self._lock:
+            return max(0.0, self._tat.get(key, 0.0) - time.time())
+
+
+class _SQLiteBucketStore:
+    """Bucket state shared by every worker process on the host"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tat REAL NOT NULL)')
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    def reserve(self, key: str, interval: float, tolerance: float, max_wait: float) -> Optional[float]:
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            now = time.time()
+            row = conn.execute('SELECT tat FROM buckets WHERE key = ?', (key,)).fetchone()
+            tat = max(row[0] if row else now, now)
+            wait = max(0.0, tat - tolerance - now)
+            if wait > max_wait:
+                conn.execute('ROLLBACK')
+                return None
+            conn.execute('INSERT OR REPLACE INTO buckets (key, tat) VALUES (?, ?)', (key, tat + interval))
+            conn.execute('COMMIT')
+            return wait
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def backlog(self, key: str) -> float:
+        row = self._connect().execute('SELECT tat FROM buckets WHERE key = ?', (key,)).fetchone()
+        return max(0.0, row[0] - time.time()) if row else 0.0
+
+
+class RateScheduler:
+    """
+    Paces outbound extractions per key (platform) with token buckets
+
+    Each key refills at `rate` tokens per second up to `burst` tokens, so idle
+    platforms start extractions immediately and sleeps only happen under load.
+    Buckets are implemented as GCRA reservations (one timestamp per key), which
+    makes the SQLite store safe to share between all workers on a host: every
+    acquire is a single short write transaction.
+    """
+
+    def __init__(self, rates: Dict[str, float], bursts: Dict[str, int],
+                 backend: str = 'memory', path: Optional[str] = None, max_wait: float = 60):
+        self.rates = rates
+        self.bursts = bursts
+        self.max_wait = max_wait
+
+        if backend == 'sqlite':
+            self._store = _SQLiteBucketStore(path)
+        elif backend == 'memory':
+            self._store = _MemoryBucketStore()
+        else:
+            raise ValueError(f"Unknown scheduler backend: {backend}. Choose from: memory, sqlite")
+        self.backend = backend
+
+        self._lock = threading.Lock()
+        self._waiting: Dict[str, int] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def acquire(self, key: str, cancel: Optional[threading.Event] = None) -> bool:
+        """
+        Wait for a token
+
+        Args:
+            key: Bucket name (platform)
+            cancel: Optional event that cuts the wait short once set (the token stays spent)
+
+        Returns:
+            True once a token was taken, False if the wait would exceed max_wait
+        """
+        rate = self.rates.get(key)
+        if not rate or rate <= 0:
+            return True  # Unpaced
+
+        interval = 1.0 / rate
+        tolerance = max(self.bursts.get(key, 1) - 1, 0) * interval
+
+        wait = self._store.reserve(key, interval, tolerance, self.max_wait)
+
+        with self._lock:
+            stats = self._stats.setdefault(key, {'acquired': 0, 'rejected': 0, 'delayed': 0,
+                                                 'total_wait': 0.0, 'max_wait': 0.0})
+            if wait is None:
+                stats['rejected'] += 1
+                return False
+            stats['acquired'] += 1
+            if wait > 0:
+                stats['delayed'] += 1
+                stats['total_wait'] += wait
+                stats['max_wait'] = max(stats['max_wait'], wait)
+                self._waiting[key] = self._waiting.get(key, 0) + 1
+
+        if wait > 0:
+            logger.info(f"⏳ Pacing {key} extraction for {wait:.2f}s")
+            try:
+                if cancel is not None:
+                    cancel.wait(wait)
+                else:
+                    time.sleep(wait)
+            finally:
+                with self._lock:
+                    self._waiting[key] -= 1
+        return True
+
+    def estimate_wait(self, key: str) -> float:
+        """
+        Seconds an acquire on this bucket would wait right now, without taking a token
+
+        Args:
+            key: Bucket name
+
+        Returns:
+            Expected wait in seconds (0 when a token is available)
+        """
+        rate = self.rates.get(key)
+        if not rate or rate <= 0:
+            return 0.0
+        tolerance = max(self.bursts.get(key, 1) - 1, 0) / rate
+        return max(0.0, self._store.backlog(key) - tolerance)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth and wait times per bucket"""
+        result = {'backend': self.backend, 'max_wait': self.max_wait, 'buckets': {}}
+
+        with self._lock:
+            for key, rate in self.rates.items():
+                stats = dict(self._stats.get(key, {'acquired': 0, 'rejected': 0, 'delayed': 0,
+                                                   'total_wait': 0.0, 'max_wait': 0.0}))
+                stats['avg_wait'] = round(stats['total_wait'] / stats['acquired'], 3) if stats['acquired'] else 0.0
+                stats['total_wait'] = round(stats['total_wait'], 3)
+                stats['max_wait'] = round(stats['max_wait'], 3)
+                result['buckets'][key] = {
+                    'rate_per_minute': round(rate * 60, 2),
+                    'burst': self.bursts.get(key, 1),
+                    'waiting_here': self._waiting.get(key, 0),
+                    **stats
+                }
+
+        for key, bucket in result['buckets'].items():
+            try:
+                # Reserved time ahead of now, across all workers sharing the store
+                backlog = self._store.backlog(key)
+                bucket['backlog_seconds'] = round(backlog, 3)
+                bucket['queue_depth'] = int(backlog * self.rates[key])
+            except Exception as e:
+                bucket['backlog_error'] = str(e)
+
+        return result
@@ -0,0 +1,262 @@
+"""
+Short Link Resolver
+Maps short links (fb.watch/..., facebook.com/share/...) to canonical video URLs without a full extraction
+"""
+import base64
+import http.client
+import logging
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit, parse_qs, unquote
+
+from app.services.cache_backends import CacheBackend, MemoryCacheBackend
+from app.utils.platform_matcher import match_url
+
+logger = logging.getLogger(__name__)
+
+# Hosts whose links only name a video after a redirect. youtu.be and instagr.am
+# links carry the ID in the path and are resolved locally by the platform matcher.
+SHORT_LINK_HOSTS = ('fb.watch',)
+# Path prefixes on platform hosts that redirect to the video (share sheets)
+SHORT_LINK_PATHS = {
+    'facebook': ('/share/',),
+}
+
+_REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+
+def is_short_link(url: str) -> bool:
+    """Whether a URL names its video only after following a redirect"""
+    match = match_url(url)
+    if match.platform == 'unknown' or match.canonical_id is not None:
+        return False
+
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or '').lower()
+    if any(host == short or host.endswith('.' + short) for short in SHORT_LINK_HOSTS):
+        return True
+    return parts.path.startswith(SHORT_LINK_PATHS.get(match.platform, ()))
+
+
+class ShortLinkResolver:
+    """
+    Resolves short links by following their redirects
+
+    Redirects are followed with HEAD requests (GET when HEAD is refused) over
+    keep-alive connections pooled per host, stopping at the first URL the
+    platform matcher can read a video ID from; nothing is downloaded. Mappings
+    are stored in the cache backend with a long TTL (a short link never points
+    anywhere else), so later requests for the same link go straight to the
+    metadata cache. Links that fail to resolve are left to yt-dlp, and the URL
+    it reports is remembered instead.
+
+    Requests can go through an http:// proxy (CONNECT tunnel for https links),
+    so resolution leaves from the same IP as the platform's extractions.
+    Other proxy schemes (socks5://) are not supported here; such links are
+    left to yt-dlp as well.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend] = None, ttl: int = 30 * 86400, timeout: float = 5,
+                 max_redirects: int = 5, user_agent: str = 'Mozilla/5.0', max_idle_per_host: int = 4):
+        self.backend = backend or MemoryCacheBackend()
+        self.ttl = ttl
+        self.timeout = timeout
+        self.max_redirects = max_redirects
+        self.user_agent = user_agent
+        self.max_idle_per_host = max_idle_per_host
+
+        self._lock = threading.Lock()
+        self._idle: Dict[Tuple[str, str, Optional[str]], List[http.client.HTTPConnection]] = {}
+        self._stats = {'hits': 0, 'resolved': 0, 'failed': 0, 'learned': 0, 'requests': 0}
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return f"short:{url.strip().split('#', 1)[0]}"
+
+    def lookup(self, url: str) -> Optional[str]:
+        """
+        Look up a known mapping without touching the network
+
+        Args:
+            url: Short link
+
+        Returns:
+            The canonical URL, or None if the link has not been resolved yet
+        """
+        try:
+            value = self.backend.get(self._key(url))
+        except Exception as e:
+            logger.warning(f"Short link cache read failed for {url}: {e}")
+            return None
+
+        if value is None:
+            return None
+        with self._lock:
+            self._stats['hits'] += 1
+        return value.decode('utf-8')
+
+    def resolve(self, url: str, proxy: Optional[str] = None) -> Optional[str]:
+        """
+        Resolve a short link to its canonical video URL
+
+        Args:
+            url: Short link
+            proxy: Optional http:// proxy URL (credentials allowed) to send the requests through
+
+        Returns:
+            The canonical URL (see platform_matcher.match_url), or None if it could not be resolved
+        """
+        resolved = self.lookup(url)
+        if resolved is not None:
+            return resolved
+
+        try:
+            resolved = self._follow(url, proxy)
+        except (OSError, http.client.HTTPException) as e:
+            logger.warning(f"Could not resolve short link {url}: {e}")
+            resolved = None
+
+        with self._lock:
+            self._stats['resolved' if resolved else 'failed'] += 1
+        if resolved is None:
+            return None
+
+        logger.info(f"🔗 Resolved {url} -> {resolved}")
+        self._store(url, resolved)
+        return resolved
+
+    def remember(self, url: str, resolved_url: Optional[str]) -> Optional[str]:
+        """
+        Record a mapping learned elsewhere (e.g. the webpage_url yt-dlp reported)
+
+        Returns:
+            The canonical URL stored for the link, or None if resolved_url names no video
+        """
+        if not resolved_url:
+            return None
+
+        match = match_url(resolved_url)
+        if match.canonical_id is None:
+            return None
+
+        self._store(url, match.normalized_url)
+        with self._lock:
+            self._stats['learned'] += 1
+        return match.normalized_url
+
+    def _store(self, url: str, resolved_url: str):
+        try:
+            self.backend.set(self._key(url), resolved_url.encode('utf-8'), self.ttl)
+        except Exception as e:
+            logger.warning(f"Short link cache write failed for {url}: {e}")
+
+    def _follow(self, url: str, proxy: Optional[str] = None) -> Optional[str]:
+        """Follow redirects until a URL names a video"""
+        current = url.strip()
+        for _ in range(self.max_redirects + 1):
+            match = match_url(current)
+            if match.canonical_id is not None:
+                return match.normalized_url
+
+            # Login walls carry the destination along (facebook.com/login/?next=...)
+            for target in parse_qs(urlsplit(current).query).get('next', []):
+                match = match_url(target)
+                if match.canonical_id is not None:
+                    return match.normalized_url
+
+            location = self._location(current, proxy)
+            if not location:
+                return None
+            current = urljoin(current, location)
+        return None
+
+    def _location(self, url: str, proxy: Optional[str] = None) -> Optional[str]:
+        """Redirect target of a URL (HEAD first, GET if the server refuses HEAD)"""
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            return None
+
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+
+        status, location = self._request(parts.scheme, parts.netloc, 'HEAD', path, proxy)
+        if status in (400, 403, 405, 501):
+            status, location = self._request(parts.scheme, parts.netloc, 'GET', path, proxy)
+        return location if status in _REDIRECT_STATUSES else None
+
+    @staticmethod
+    def _proxy_auth(proxy: str) -> Dict[str, str]:
+        parts = urlsplit(proxy)
+        if parts.username is None:
+            return {}
+        credentials = f"{unquote(parts.username)}:{unquote(parts.password or '')}"
+        return {'Proxy-Authorization': 'Basic ' + base64.b64encode(credentials.encode('utf-8')).decode('ascii')}
+
+    def _connect(self, scheme: str, netloc: str, proxy: Optional[str]) -> http.client.HTTPConnection:
+        """Open a connection to a host, directly or through an http:// proxy"""
+        connection_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        if not proxy:
+            return connection_class(netloc, timeout=self.timeout)
+
+        parts = urlsplit(proxy)
+        if parts.scheme != 'http' or not parts.hostname:
+            raise OSError(f"Unsupported proxy for short link resolution: {parts.scheme}://")
+        if scheme != 'https':
+            return http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=self.timeout)
+
+        # CONNECT tunnel; TLS is still negotiated with (and verified for) the target host
+        conn = connection_class(parts.hostname, parts.port or 80, timeout=self.timeout)
+        target = urlsplit(f"https://{netloc}")
+        conn.set_tunnel(target.hostname, target.port or 443, headers=self._proxy_auth(proxy))
+        return conn
+
+    def _request(self, scheme: str, netloc: str, method: str, path: str,
+                 proxy: Optional[str] = None) -> Tuple[int, Optional[str]]:
+        """One request over a pooled connection; returns (status, Location header)"""
+        headers = {'User-Agent': self.user_agent, 'Accept': '*/*'}
+        if proxy and scheme != 'https':
+            # Plain http goes to the proxy with the absolute URL
+            path = f"http://{netloc}{path}"
+            headers.update(self._proxy_auth(proxy))
+
+        pool_key = (scheme, netloc, proxy)
+        with self._lock:
+            self._stats['requests'] += 1
+            idle = self._idle.get(pool_key)
+            conn = idle.pop() if idle else None
+
+        while True:
+            pooled = conn is not None
+            if conn is None:
+                conn = self._connect(scheme, netloc, proxy)
+            try:
+                conn.request(method, path, headers=headers)
+                response = conn.getresponse()
+                break
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = None
+                if not pooled:
+                    raise
+                # The pooled connection had gone stale, retry on a new one
+
+        location = response.getheader('Location')
+        # Reading a GET body just to reuse the connection is not worth it
+        keep = method == 'HEAD' and not response.will_close
+        response.close()
+
+        if keep:
+            with self._lock:
+                idle = self._idle.setdefault(pool_key, [])
+                if len(idle) < self.max_idle_per_host:
+                    idle.append(conn)
+                    conn = None
+        if conn is not None:
+            conn.close()
+        return response.status, location
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Resolution counters for monitoring"""
+        with self._lock:
+            return {**self._stats, 'pooled_connections': sum(len(c) for c in self._idle.values())}
@@ -0,0 +1,88 @@
+"""
+Single-Flight Request Coalescing
+Concurrent calls for the same key share one execution and its result
+"""
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """An in-flight execution and the callers waiting on it"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls by key
+
+    The first caller for a key runs the function; callers arriving while it
+    is still running block until it finishes and receive the same result
+    (or the same exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._stats = {'executions': 0, 'coalesced': 0, 'max_waiters': 0}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run fn once per key among concurrent callers
+
+        Args:
+            key: Identity of the work (e.g. platform + canonical video ID)
+            fn: Zero-argument callable doing the work
+
+        Returns:
+            Tuple of (result, shared) where shared is True when the same result
+            object was handed to more than one caller (treat it as read-only)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self._stats['coalesced'] += 1
+                self._stats['max_waiters'] = max(self._stats['max_waiters'], call.waiters)
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self._stats['executions'] += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+            if call.waiters:
+                logger.info(f"🔗 Coalesced {call.waiters} waiting request(s) for {key}")
+
+        # The key was removed above, so the waiter count is final
+        return call.result, call.waiters > 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Coalescing counters for monitoring"""
+        with self._lock:
+            return {
+                'in_flight': len(self._calls),
+                'waiting': sum(call.waiters for call in self._calls.values()),
+                **self._stats
+            }
@@ -0,0 +1,98 @@
+"""
+Strategy Statistics
+Rolling success rate and latency per (platform, strategy), used to order extraction strategies
+"""
+import logging
+import random
+import threading
+from collections import deque
+from typing import Dict, Any, Deque, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class StrategyStats:
+    """
+    Learns which extraction strategy works best per platform
+
+    Keeps the last `window` outcomes of every (platform, strategy) pair and
+    ranks strategies by expected time to success: mean attempt latency divided
+    by the (Laplace-smoothed) success rate. Trying strategies in ascending
+    order of that ratio minimises the expected time until one succeeds.
+    With probability `epsilon` a random strategy is moved to the front, so
+    strategies that are currently losing keep being sampled and can recover.
+    Strategies without history tie, which keeps their configured order.
+    """
+
+    def __init__(self, window: int = 100, epsilon: float = 0.1, prior_latency: float = 10.0):
+        self.window = window
+        self.epsilon = epsilon
+        self.prior_latency = prior_latency
+        self._lock = threading.Lock()
+        self._outcomes: Dict[Tuple[str, str], Deque[Tuple[bool, float]]] = {}
+        self._explored = 0
+
+    def record(self, platform: str, strategy: str, success: bool, latency: float):
+        """
+        Record the outcome of one attempt
+
+        Args:
+            platform: Platform name
+            strategy: Strategy name
+            success: Whether the attempt returned metadata
+            latency: Seconds the attempt took
+        """
+        with self._lock:
+            outcomes = self._outcomes.setdefault((platform, strategy), deque(maxlen=self.window))
+            outcomes.append((success, latency))
+
+    def _summary(self, platform: str, strategy: str) -> Dict[str, Any]:
+        outcomes = self._outcomes.get((platform, strategy), ())
+        attempts = len(outcomes)
+        successes = sum(1 for success, _ in outcomes if success)
+        latency = sum(latency for _, latency in outcomes) / attempts if attempts else self.prior_latency
+        success_rate = (successes + 1) / (attempts + 2)
+        return {
+            'attempts': attempts,
+            'successes': successes,
+            'success_rate': round(success_rate, 3),
+            'avg_latency': round(latency, 3),
+            'expected_time': round(latency / success_rate, 3),
+        }
+
+    def order(self, platform: str, strategies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Sort strategies by expected time to success, with epsilon exploration
+
+        Args:
+            platform: Platform name
+            strategies: Strategy dicts with a 'name' key
+
+        Returns:
+            New list in the order the strategies should be tried
+        """
+        with self._lock:
+            ranked = sorted(strategies, key=lambda s: self._summary(platform, s['name'])['expected_time'])
+
+            if len(ranked) > 1 and random.random() < self.epsilon:
+                self._explored += 1
+                ranked.insert(0, ranked.pop(random.randrange(1, len(ranked))))
+
+        return ranked
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-platform strategy summaries, in current preference order"""
+        with self._lock:
+            platforms: Dict[str, Dict[str, Any]] = {}
+            for platform, strategy in self._outcomes:
+                platforms.setdefault(platform, {})[strategy] = self._summary(platform, strategy)
+
+            for platform, strategies in platforms.items():
+                platforms[platform] = dict(sorted(strategies.items(), key=lambda item: item[1]['expected_time']))
+
+            return {
+                'window': self.window,
+                'epsilon': self.epsilon,
+                'explored': self._explored,
+                'platforms': platforms,
+            }
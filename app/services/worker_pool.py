@@ -0,0 +1,271 @@
+"""
+yt-dlp Worker Pool
+Persistent worker processes with yt_dlp pre-imported, fed extraction jobs over pipes
+"""
+import atexit
+import logging
+import multiprocessing
+import os
+import queue
+import resource
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+from app.services.extraction_engine import CANCELLED_ERROR
+
+logger = logging.getLogger(__name__)
+
+
+def _rss_mb() -> float:
+    """Current resident set size of this process in MB"""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        # Peak RSS (KB on Linux) when /proc is not available
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _worker_main(conn):
+    """
+    Worker process loop
+
+    Imports yt_dlp once, then answers ('extract', url, args) jobs with
+    ((success, metadata, error), rss_mb) until it receives None.
+    ('discard', path) messages drop warm instances and get no reply.
+    """
+    from app.services.extraction_engine import InProcessEngine
+    import yt_dlp  # noqa: F401  (pay the import before the first job)
+
+    engine = InProcessEngine()
+
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+
+        if job is None:
+            break
+
+        if job[0] == 'discard':
+            engine.discard(job[1])
+            continue
+
+        _, url, args = job
+        try:
+            result = engine.extract(url, args, 0)
+        except Exception as e:
+            result = (False, None, f"Worker error: {e}")
+
+        try:
+            conn.send((result, _rss_mb()))
+        except (BrokenPipeError, OSError):
+            break
+
+    engine.clear()
+    conn.close()
+
+
+class _Worker:
+    """Handle on a single worker process"""
+
+    def __init__(self, ctx):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.jobs = 0
+        self.rss_mb = 0.0
+        self.seen: Dict[str, int] = {}  # argument -> pool epoch of the last job that used it
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid
+
+    def stop(self):
+        """Ask the worker to exit, killing it if it does not"""
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=2)
+        self.kill()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(timeout=2)
+        self.conn.close()
+
+
+class WorkerPoolEngine:
+    """
+    Runs extractions in a pool of warm, long-lived worker processes
+
+    Keeps the crash isolation of the subprocess engine without paying the
+    interpreter startup and yt-dlp import on every request. Workers are
+    recycled after max_jobs jobs or once their RSS grows past max_rss_mb,
+    and killed and replaced (in the background) when a job exceeds its
+    timeout.
+    """
+
+    name = 'pool'
+
+    def __init__(self, size: int = 4, max_jobs: int = 100, max_rss_mb: int = 512,
+                 start_method: str = 'spawn'):
+        self.size = size
+        self.max_jobs = max_jobs
+        self.max_rss_mb = max_rss_mb
+        self._ctx = multiprocessing.get_context(start_method)
+        self._idle: "queue.LifoQueue[_Worker]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._started = False
+        self._closed = False
+        self._epoch = 0
+        self._retired: Dict[str, int] = {}
+        self._stats = {'jobs': 0, 'recycled': 0, 'timeouts': 0, 'cancelled': 0, 'crashes': 0}
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._started:
+                return
+            for _ in range(self.size):
+                self._idle.put(_Worker(self._ctx))
+            self._started = True
+            atexit.register(self.shutdown)
+            logger.info(f"Started {self.size} yt-dlp worker processes")
+
+    def _count(self, stat: str):
+        with self._lock:
+            self._stats[stat] += 1
+
+    def _replace(self, worker: _Worker, reason: str, kill: bool = False):
+        """Retire a worker and put a fresh one in its place, off the request thread"""
+        logger.info(f"Recycling yt-dlp worker {worker.pid}: {reason}")
+        threading.Thread(target=self._respawn, args=(worker, kill),
+                         name='yt-dlp-respawn', daemon=True).start()
+
+    def _respawn(self, worker: _Worker, kill: bool):
+        if kill:
+            worker.kill()
+        else:
+            worker.stop()
+
+        if self._closed:
+            return
+        try:
+            fresh = _Worker(self._ctx)
+        except Exception as e:
+            logger.error(f"Failed to start a replacement yt-dlp worker: {e}")
+            return
+        self._idle.put(fresh)
+        if self._closed:  # shutdown() ran while it was starting
+            self.shutdown()
+
+    def _forward_discards(self, worker: _Worker):
+        """Pass discards issued since the worker last used a file on to it"""
+        with self._lock:
+            stale = [path for path, epoch in worker.seen.items() if self._retired.get(path, -1) >= epoch]
+        for path in stale:
+            worker.conn.send(('discard', path))
+            del worker.seen[path]
+
+    def discard(self, path: str):
+        """
+        Drop warm instances whose options reference a file (e.g. a replaced cookie jar)
+
+        Workers get the discard before their next job, so busy ones pick it
+        up once they are checked out again.
+
+        Args:
+            path: File path as it appears in the yt-dlp arguments
+        """
+        with self._lock:
+            self._retired[path] = self._epoch
+            self._epoch += 1
+
+    def extract(self, url: str, args: List[str], timeout: int,
+                cancel: Optional[threading.Event] = None) -> Tuple[bool, Optional[Dict], Optional[str]]:
+        """
+        Extract metadata for a single URL on a pooled worker
+
+        Args:
+            url: The video URL
+            args: yt-dlp CLI arguments (without the URL)
+            timeout: Seconds to wait for a free worker and again for the job itself
+            cancel: Optional event; the worker is killed and replaced once it is set
+
+        Returns:
+            Tuple of (success, metadata, error message)
+        """
+        self._ensure_started()
+
+        try:
+            worker = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No yt-dlp worker became available within {timeout} seconds")
+
+        try:
+            self._forward_discards(worker)
+            with self._lock:
+                epoch = self._epoch
+            for arg in args:
+                worker.seen[arg] = epoch
+            worker.conn.send(('extract', url, list(args)))
+
+            deadline = time.monotonic() + timeout
+            while not worker.conn.poll(min(0.5, max(deadline - time.monotonic(), 0))):
+                if cancel is not None and cancel.is_set():
+                    self._count('cancelled')
+                    self._replace(worker, "job cancelled", kill=True)
+                    return False, None, CANCELLED_ERROR
+                if time.monotonic() >= deadline:
+                    self._count('timeouts')
+                    self._replace(worker, f"job exceeded {timeout}s", kill=True)
+                    raise TimeoutError(f"Extraction timed out after {timeout} seconds")
+
+            result, worker.rss_mb = worker.conn.recv()
+
+        except (EOFError, BrokenPipeError, ConnectionResetError, OSError) as e:
+            self._count('crashes')
+            self._replace(worker, f"worker died ({e})", kill=True)
+            return False, None, f"yt-dlp worker crashed: {e}"
+
+        worker.jobs += 1
+        self._count('jobs')
+
+        if worker.jobs >= self.max_jobs:
+            self._count('recycled')
+            self._replace(worker, f"served {worker.jobs} jobs")
+        elif worker.rss_mb >= self.max_rss_mb:
+            self._count('recycled')
+            self._replace(worker, f"RSS {worker.rss_mb:.0f} MB")
+        else:
+            self._idle.put(worker)
+
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool counters for monitoring"""
+        with self._lock:
+            stats = dict(self._stats)
+        return {
+            'size': self.size,
+            'idle': self._idle.qsize(),
+            'max_jobs_per_worker': self.max_jobs,
+            'max_rss_mb': self.max_rss_mb,
+            **stats
+        }
+
+    def shutdown(self):
+        """Stop all idle workers"""
+        self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            worker.stop()
@@ -6,8 +6,11 @@ import subprocess
 import json
 import logging
 import sys
+import threading
 from typing import Dict, Any, Optional, Tuple
 
+from app.services.extraction_engine import ytdlp_version
+
 logger = logging.getLogger(__name__)
 
 class YtDlpService:
@@ -17,31 +20,11 @@ class YtDlpService:
         """Initialize the service"""
         self.timeout = 60
         self.max_retries = 3
-        self.ytdlp_available = self._check_ytdlp_installation()
+        self.ytdlp_available = ytdlp_version() is not None
         
         if not self.ytdlp_available:
             raise RuntimeError("yt-dlp is not available via Python module")
-    
-    def _check_ytdlp_installation(self) -> bool:
-        """Check if yt-dlp is properly installed"""
-        try:
-            result = subprocess.run(
-                [sys.executable, '-m', 'yt_dlp', '--version'], 
-                capture_output=True, 
-                text=True, 
-                timeout=10
-            )
-            
-            if result.returncode == 0:
-                logger.info(f"yt-dlp found via Python module: {result.stdout.strip()}")
-                return True
-            else:
-                logger.error(f"yt-dlp module check failed: {result.stderr}")
-                return False
-                
-        except (FileNotFoundError, subprocess.TimeoutExpired) as e:
-            logger.error(f"yt-dlp check failed: {e}")
-            return False
+        logger.info(f"yt-dlp found via Python module: {ytdlp_version()}")
     
     def extract_metadata_raw(self, url: str) -> Tuple[bool, Optional[Dict[Any, Any]], Optional[str]]:
         """
@@ -141,5 +124,19 @@ class YtDlpService:
         
         return cleaned
 
-# Create service instance
-ytdlp_service = YtDlpService()
+_service = None
+_service_lock = threading.Lock()
+
+def get_ytdlp_service() -> YtDlpService:
+    """Shared service, created on first use"""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = YtDlpService()
+        return _service
+
+def __getattr__(name: str):
+    # `from ... import ytdlp_service` keeps working, creating the service lazily
+    if name == 'ytdlp_service':
+        return get_ytdlp_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
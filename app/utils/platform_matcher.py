@@ -0,0 +1,110 @@
+"""
+Platform Matcher
+Table-driven platform detection and canonical video ID extraction in one pass
+"""
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional
+from urllib.parse import urlsplit, parse_qs
+
+# Registrable domain -> platform; subdomains match on label boundaries only
+PLATFORM_DOMAINS = {
+    'youtube.com': 'youtube',
+    'youtu.be': 'youtube',
+    'youtube-nocookie.com': 'youtube',
+    'instagram.com': 'instagram',
+    'instagr.am': 'instagram',
+    'facebook.com': 'facebook',
+    'fb.com': 'facebook',
+    'fb.watch': 'facebook',
+}
+
+# Video ID patterns per platform, matched against the URL path (host already known)
+_ID_PATTERNS = {
+    'youtube': re.compile(r'/(?:embed|shorts|live|v)/([0-9A-Za-z_-]{11})(?:[/?#]|$)'),
+    'instagram': re.compile(r'/(?:[^/]+/)?(p|reels?|tv)/([0-9A-Za-z_-]+)'),
+    'facebook': re.compile(r'/(?:[^/]+/)?(?:videos|reel)/(?:[^/]+/)?(\d+)'),
+}
+_YOUTUBE_ID = re.compile(r'[0-9A-Za-z_-]{11}')
+_YOUTU_BE_PATH = re.compile(r'/([0-9A-Za-z_-]{11})(?:[/?#]|$)')
+
+
+class PlatformMatch(NamedTuple):
+    platform: str                  # 'youtube', 'instagram', 'facebook' or 'unknown'
+    canonical_id: Optional[str]    # None when the URL alone does not identify the video
+    normalized_url: str            # canonical watch URL when the ID is known, else the input URL
+
+
+def _platform_for_host(host: str) -> str:
+    """Look the host and each parent domain up in PLATFORM_DOMAINS"""
+    labels = host.rstrip('.').split('.')
+    for i in range(len(labels) - 1):
+        platform = PLATFORM_DOMAINS.get('.'.join(labels[i:]))
+        if platform:
+            return platform
+    return 'unknown'
+
+
+def _match_id(platform: str, host: str, path: str, query: str) -> Optional[PlatformMatch]:
+    if platform == 'youtube':
+        if host.endswith('youtu.be'):
+            match = _YOUTU_BE_PATH.match(path)
+            video_id = match.group(1) if match else None
+        else:
+            video_id = (parse_qs(query).get('v') or [None])[0]
+            if not (video_id and _YOUTUBE_ID.fullmatch(video_id)):
+                match = _ID_PATTERNS['youtube'].search(path)
+                video_id = match.group(1) if match else None
+        if video_id:
+            return PlatformMatch(platform, video_id, f"https://www.youtube.com/watch?v={video_id}")
+
+    elif platform == 'instagram':
+        match = _ID_PATTERNS['instagram'].search(path)
+        if match:
+            kind, video_id = match.groups()
+            kind = 'reel' if kind.startswith('reel') else kind
+            return PlatformMatch(platform, video_id, f"https://www.instagram.com/{kind}/{video_id}/")
+
+    elif platform == 'facebook':
+        # watch/?v=ID and video.php?v=ID
+        video_id = (parse_qs(query).get('v') or [None])[0]
+        if not (video_id and video_id.isdigit()):
+            match = _ID_PATTERNS['facebook'].search(path)
+            video_id = match.group(1) if match else None
+        if video_id:
+            return PlatformMatch(platform, video_id, f"https://www.facebook.com/watch/?v={video_id}")
+
+    return None
+
+
+@lru_cache(maxsize=4096)
+def match_url(url: str) -> PlatformMatch:
+    """
+    Detect the platform of a URL and extract its canonical video ID
+
+    Different URL shapes for the same video (youtu.be/X, watch?v=X&t=10,
+    m.youtube.com/watch?v=X) map to the same ID and normalized URL. Hosts
+    match on label boundaries, so `notyoutube.com` or `youtube.com.evil`
+    are not YouTube. Results are memoized, so repeated lookups of the same
+    URL during a request are free.
+
+    Args:
+        url: Video URL
+
+    Returns:
+        PlatformMatch(platform, canonical_id, normalized_url)
+    """
+    try:
+        parts = urlsplit(url.strip())
+        host = (parts.hostname or '').lower()
+    except (ValueError, AttributeError):
+        return PlatformMatch('unknown', None, url)
+
+    if not parts.scheme or not host:
+        return PlatformMatch('unknown', None, url)
+
+    platform = _platform_for_host(host)
+    if platform == 'unknown':
+        return PlatformMatch(platform, None, url)
+
+    return _match_id(platform, host, parts.path, parts.query) or PlatformMatch(platform, None, url)
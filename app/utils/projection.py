@@ -0,0 +1,97 @@
+"""
+Field Projection Utilities
+Prune metadata dicts down to (or away from) dotted field paths
+"""
+from typing import Any, Dict
+
+# A parsed path set: {'formats': {'url': {}}, 'title': {}}
+# An empty subtree means "the whole value"
+FieldTree = Dict[str, 'FieldTree']
+
+def parse_field_paths(value: str) -> FieldTree:
+    """
+    Parse a comma separated list of dotted paths into a field tree
+
+    Args:
+        value: e.g. "title,formats.url,automatic_captions.en"
+
+    Returns:
+        Nested dict of path segments (empty if value is empty)
+    """
+    tree: FieldTree = {}
+
+    for path in (value or '').split(','):
+        parts = [part for part in path.strip().split('.') if part]
+        if not parts:
+            continue
+
+        node = tree
+        for i, part in enumerate(parts):
+            if part in node and not node[part]:
+                # A shorter path already selects the whole value
+                break
+            if i == len(parts) - 1:
+                node[part] = {}
+            else:
+                node = node.setdefault(part, {})
+
+    return tree
+
+def project_fields(data: Any, tree: FieldTree) -> Any:
+    """
+    Keep only the selected paths
+
+    Lists are traversed transparently, so `formats.url` keeps the url
+    of every format.
+
+    Args:
+        data: Metadata dict (or list / scalar while recursing)
+        tree: Parsed field tree
+
+    Returns:
+        New pruned structure; the input is not modified
+    """
+    if not tree:
+        return data
+
+    if isinstance(data, list):
+        return [project_fields(item, tree) for item in data]
+
+    if not isinstance(data, dict):
+        return data
+
+    return {
+        key: project_fields(data[key], subtree)
+        for key, subtree in tree.items()
+        if key in data
+    }
+
+def exclude_fields(data: Any, tree: FieldTree) -> Any:
+    """
+    Drop the selected paths
+
+    Args:
+        data: Metadata dict (or list / scalar while recursing)
+        tree: Parsed field tree
+
+    Returns:
+        New pruned structure; the input is not modified
+    """
+    if not tree:
+        return data
+
+    if isinstance(data, list):
+        return [exclude_fields(item, tree) for item in data]
+
+    if not isinstance(data, dict):
+        return data
+
+    result = {}
+    for key, value in data.items():
+        subtree = tree.get(key)
+        if subtree is None:
+            result[key] = value
+        elif subtree:
+            result[key] = exclude_fields(value, subtree)
+
+    return result
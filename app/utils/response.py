@@ -0,0 +1,90 @@
+"""
+API Response Utilities
+Shape raw yt-dlp metadata into the extraction response
+"""
+from typing import Any, Dict, Set
+from app.utils.projection import FieldTree, project_fields, exclude_fields
+
+# Top-level keys of the default extraction response
+RESULT_FIELDS = (
+    'filename', 'type', 'channel', 'comment_count', 'aspect_ratio', 'description', 'title',
+    'duration', 'ext', 'comments', 'webpage_url', 'webpage_url_domain', 'width', 'height',
+    'view_count', 'like_count', 'upload_date', 'formats', 'detected_platform', 'extraction_service'
+)
+
+# Fields of the `mode=basic` preview tier (what the web interface shows)
+BASIC_FIELDS = ('title', 'uploader', 'duration', 'view_count', 'upload_date', 'like_count')
+
+EXTRACTION_MODES = ('full', 'basic')
+
+def mode_fields(mode: str, fields: str) -> str:
+    """
+    `fields=` value for an extraction mode
+    
+    Args:
+        mode: 'full' (default response) or 'basic' (preview fields only)
+        fields: Explicit `fields=` value, which takes precedence
+        
+    Returns:
+        The `fields=` value to use
+    """
+    mode = (mode or 'full').lower()
+    if mode not in EXTRACTION_MODES:
+        raise ValueError(f"Unknown mode: {mode}. Choose from: {', '.join(EXTRACTION_MODES)}")
+    if mode == 'basic' and not fields:
+        return ','.join(BASIC_FIELDS)
+    return fields or ''
+
+def requested_fields(fields: FieldTree, excluded: FieldTree) -> Set[str]:
+    """
+    Top-level metadata keys a projection will actually use
+    
+    Args:
+        fields: Parsed `fields=` tree (empty means the default response)
+        excluded: Parsed `exclude=` tree
+        
+    Returns:
+        Set of top-level keys
+    """
+    if fields:
+        return set(fields)
+    return set(RESULT_FIELDS) - {key for key, subtree in excluded.items() if not subtree}
+
+def build_result(raw_metadata: Dict[str, Any], url: str, platform: str,
+                 fields: FieldTree, excluded: FieldTree) -> Dict[str, Any]:
+    """Shape raw yt-dlp metadata into the API response, applying projection"""
+    # ✅ Add platform info to response
+    raw_metadata['platform_info'] = {
+        'detected_platform': platform,
+        'extraction_service': 'multi_platform_ytdlp'
+    }
+
+    result = {
+        'filename': raw_metadata.get('_filename', raw_metadata.get('filename', 'Unknown')),
+        'type': raw_metadata.get('_type', 'video'),
+        'channel': raw_metadata.get('channel', raw_metadata.get('uploader', 'Unknown')),
+        'comment_count': raw_metadata.get('comment_count', 0),
+        'aspect_ratio': raw_metadata.get('aspect_ratio'),
+        'description': raw_metadata.get('description', ''),
+        'title': raw_metadata.get('title', 'Unknown'),
+        'duration': raw_metadata.get('duration'),
+        'ext': raw_metadata.get('ext', 'mp4'),
+        'comments': raw_metadata.get('comments', []),
+        'webpage_url': raw_metadata.get('webpage_url', url),
+        'webpage_url_domain': raw_metadata.get('webpage_url_domain', ''),
+        'width': raw_metadata.get('width'),
+        'height': raw_metadata.get('height'),
+        'view_count': raw_metadata.get('view_count'),
+        'like_count': raw_metadata.get('like_count'),
+        'upload_date': raw_metadata.get('upload_date'),
+        'formats': raw_metadata.get('formats', []),
+        'detected_platform': platform,
+        'extraction_service': 'multi_platform_ytdlp'
+    }
+
+    if fields:
+        # Requested fields may come from the full raw metadata
+        result = project_fields({**raw_metadata, **result}, fields)
+    if excluded:
+        result = exclude_fields(result, excluded)
+    return result
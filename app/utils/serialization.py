@@ -0,0 +1,61 @@
+"""
+Response Serialization Utilities
+Content negotiation between JSON and compact binary encodings (MessagePack, CBOR)
+"""
+from typing import Any, List, Optional
+
+try:
+    import msgpack
+except ImportError:  # Optional dependency, MessagePack is not offered without it
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:  # Optional dependency, CBOR is not offered without it
+    cbor2 = None
+
+JSON_MIMETYPE = 'application/json'
+MSGPACK_MIMETYPES = ('application/msgpack', 'application/x-msgpack', 'application/vnd.msgpack')
+CBOR_MIMETYPE = 'application/cbor'
+
+def available_mimetypes() -> List[str]:
+    """Response encodings this server can produce, JSON (the default) first"""
+    mimetypes = [JSON_MIMETYPE]
+    if msgpack is not None:
+        mimetypes.extend(MSGPACK_MIMETYPES)
+    if cbor2 is not None:
+        mimetypes.append(CBOR_MIMETYPE)
+    return mimetypes
+
+def negotiate(accept) -> Optional[str]:
+    """
+    Pick a binary encoding from the request's Accept header
+
+    JSON wins ties (including `*/*` and a missing header), and binary types
+    whose library is not installed are never chosen.
+
+    Args:
+        accept: werkzeug MIMEAccept (flask.request.accept_mimetypes)
+
+    Returns:
+        The binary mimetype to respond with, or None for JSON
+    """
+    best = accept.best_match(available_mimetypes(), default=JSON_MIMETYPE)
+    return None if best == JSON_MIMETYPE else best
+
+def encode(data: Any, mimetype: str) -> bytes:
+    """
+    Serialize a JSON-compatible structure in a binary encoding
+
+    Args:
+        data: Same structure that would otherwise be sent as JSON
+        mimetype: A mimetype returned by negotiate
+
+    Returns:
+        Encoded body
+    """
+    if mimetype in MSGPACK_MIMETYPES:
+        return msgpack.packb(data, use_bin_type=True)
+    if mimetype == CBOR_MIMETYPE:
+        return cbor2.dumps(data)
+    raise ValueError(f"Unsupported response encoding: {mimetype}")
@@ -0,0 +1,78 @@
+"""
+Streaming JSON Utilities
+Serialize large metadata dicts incrementally, cheap fields first
+"""
+import json
+from typing import Any, Dict, Iterable, Iterator
+
+# Fields that can be hundreds of KB; they are sent last, element by element
+LARGE_FIELDS = (
+    'formats', 'requested_formats', 'thumbnails', 'comments',
+    'subtitles', 'automatic_captions', 'heatmap', 'chapters',
+)
+
+def iter_json(data: Dict[str, Any], large_fields: Iterable[str] = LARGE_FIELDS,
+              chunk_size: int = 16 * 1024) -> Iterator[str]:
+    """
+    Yield a dict as JSON text in chunks
+
+    Small top-level values (title, duration, channel, ...) are written first
+    so clients can start rendering; large lists and dicts follow and are
+    serialized one element at a time, so the full document never has to be
+    held in memory as a single string.
+
+    Args:
+        data: Top-level dict to serialize
+        large_fields: Keys to defer and stream element by element
+        chunk_size: Approximate size of each yielded chunk
+
+    Yields:
+        Pieces of a valid JSON document
+    """
+    large_fields = set(large_fields)
+    small_keys = [key for key in data if key not in large_fields]
+    large_keys = [key for key in data if key in large_fields]
+
+    buffer = []
+    size = 0
+
+    def emit(text: str):
+        nonlocal size
+        buffer.append(text)
+        size += len(text)
+
+    emit('{')
+    for i, key in enumerate(small_keys + large_keys):
+        if i:
+            emit(',')
+        emit(json.dumps(str(key)) + ':')
+
+        value = data[key]
+        if key in large_fields and isinstance(value, (list, dict)) and value:
+            is_list = isinstance(value, list)
+            items = value if is_list else value.items()
+            emit('[' if is_list else '{')
+
+            for j, item in enumerate(items):
+                if j:
+                    emit(',')
+                if is_list:
+                    emit(json.dumps(item))
+                else:
+                    emit(json.dumps(str(item[0])) + ':' + json.dumps(item[1]))
+
+                if size >= chunk_size:
+                    yield ''.join(buffer)
+                    buffer, size = [], 0
+
+            emit(']' if is_list else '}')
+        else:
+            emit(json.dumps(value))
+
+        if size >= chunk_size or key == (small_keys[-1] if small_keys else None):
+            # Flush the cheap fields as soon as they are all written
+            yield ''.join(buffer)
+            buffer, size = [], 0
+
+    emit('}')
+    yield ''.join(buffer)
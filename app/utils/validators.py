@@ -1,9 +1,13 @@
 """
 URL Validation Utilities
 """
-import re
+import ipaddress
+import socket
+from typing import Iterable, Optional
 from urllib.parse import urlparse
 
+from app.utils.platform_matcher import match_url
+
 def is_valid_url(url: str) -> bool:
     """
     Check if the provided string is a valid URL
@@ -36,16 +40,53 @@ def is_youtube_url(url: str) -> bool:
     if not is_valid_url(url):
         return False
     
-    youtube_patterns = [
-        r'(?:youtube\.com/watch\?v=|youtu\.be/|youtube\.com/embed/)',
-        r'youtube\.com/.*[?&]v=',
-    ]
+    match = match_url(url)
+    return match.platform == 'youtube' and match.canonical_id is not None
+
+def resolve_callback_address(url: str, allowed_hosts: Iterable[str] = ()) -> Optional[str]:
+    """
+    Resolve a webhook URL to an address that is safe to connect to
+    
+    Callback URLs come from API clients, so they must not reach the server's
+    own network: every address the host resolves to has to be public (not
+    loopback, private, link-local, reserved or multicast). Connect to the
+    returned address rather than resolving the name again, so the check
+    cannot be raced by a DNS answer that changes in between.
     
-    for pattern in youtube_patterns:
-        if re.search(pattern, url, re.IGNORECASE):
-            return True
+    Args:
+        url: http(s) URL to validate
+        allowed_hosts: Optional allow-list; when given, the host must be one
+            of them or a subdomain of one
+        
+    Returns:
+        An IP address to connect to, or None if the URL must not be called
+    """
+    if not is_valid_url(url):
+        return None
+    
+    parts = urlparse(url.strip())
+    host = (parts.hostname or '').lower()
+    if parts.scheme not in ('http', 'https') or not host:
+        return None
+    
+    allowed_hosts = [allowed.lower() for allowed in allowed_hosts]
+    if allowed_hosts and not any(host == allowed or host.endswith('.' + allowed) for allowed in allowed_hosts):
+        return None
+    
+    try:
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        infos = socket.getaddrinfo(host, port, proto=socket.IPPROTO_TCP)
+    except (OSError, ValueError):
+        return None
     
-    return False
+    addresses = [info[4][0] for info in infos]
+    for address in addresses:
+        ip = ipaddress.ip_address(address.split('%', 1)[0])
+        if ip.version == 6 and ip.ipv4_mapped is not None:
+            ip = ip.ipv4_mapped
+        if not ip.is_global or ip.is_multicast:
+            return None
+    return addresses[0] if addresses else None
 
 def sanitize_url(url: str) -> str:
     """
@@ -3,7 +3,8 @@
  */
 class YtDlpExtractor {
     constructor() {
-        this.apiBaseUrl = '/api';
+        this.apiBaseUrl = '';
+        this.currentUrl = null;
         this.currentMetadata = null;
         
         // DOM elements
@@ -48,19 +49,13 @@ class YtDlpExtractor {
         this.hideResult();
         
         try {
-            const response = await fetch(`${this.apiBaseUrl}/extract`, {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify({ url: url })
-            });
+            // The preview only needs the basic fields, which skip format and caption resolution
+            const data = await this.fetchMetadata(url, 'basic');
             
-            const data = await response.json();
-            
-            if (data.success) {
-                this.currentMetadata = data.data;
-                this.showResult(data.data);
+            if (!data.error) {
+                this.currentUrl = url;
+                this.currentMetadata = data;
+                this.showResult(data);
             } else {
                 this.showError(data.error || 'Failed to extract metadata');
             }
@@ -73,6 +68,12 @@ class YtDlpExtractor {
         }
     }
     
+    async fetchMetadata(url, mode) {
+        const params = new URLSearchParams({ url: url, mode: mode });
+        const response = await fetch(`${this.apiBaseUrl}/?${params}`);
+        return response.json();
+    }
+    
     showResult(metadata) {
         // Create metadata preview
         this.createMetadataPreview(metadata);
@@ -149,8 +150,25 @@ class YtDlpExtractor {
         }
     }
     
-    downloadJson() {
-        if (!this.currentMetadata) return;
+    async downloadJson() {
+        if (!this.currentUrl) return;
+        
+        // Download the full metadata (served from cache once it has been extracted; previews reuse that entry too)
+        this.downloadBtn.disabled = true;
+        try {
+            const data = await this.fetchMetadata(this.currentUrl, 'full');
+            if (data.error) {
+                this.showError(data.error);
+                return;
+            }
+            this.currentMetadata = data;
+        } catch (error) {
+            console.error('Network error:', error);
+            this.showError('Network error: Unable to connect to server');
+            return;
+        } finally {
+            this.downloadBtn.disabled = false;
+        }
         
         const dataStr = JSON.stringify(this.currentMetadata, null, 2);
         const dataBlob = new Blob([dataStr], { type: 'application/json' });